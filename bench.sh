@@ -0,0 +1 @@
+python3 bench/run_benchmarks.py "$@"
\ No newline at end of file
@@ -0,0 +1,58 @@
+import os
+import re
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from block_markdown import block_to_block_type
+
+BLOCKS = [
+    "## A heading for the next section",
+    "```\nprint(\"hello\")\nprint(\"world\")\n```",
+    "> A quote\n> spread over\n> three lines",
+    "* First item\n* Second item\n* Third item",
+    "1. First step\n2. Second step\n3. Third step",
+    "A normal paragraph with **bold** text, a [link](https://www.boot.dev/) and some more words to read.",
+    "Another paragraph\nthat spans two lines.",
+]
+
+def legacy_block_to_block_type(markdown):
+    if re.match(r"#{1,6}(?= )", markdown):
+        return "heading"
+    elif re.match(r"^`{3}[\s\S]*`{3}$", markdown):
+        return "code"
+    elif re.fullmatch(r"^(>.*\n?)*$", markdown, re.MULTILINE):
+        return "quote"
+    elif re.fullmatch(r"^([-*] .*\n?)*$", markdown, re.MULTILINE):
+        return "unordered list"
+    elif re.fullmatch(r"^([0-9]+. .*\n?)*$", markdown, re.MULTILINE):
+        return "ordered list"
+    else:
+        return "normal"
+
+def classify_all(classifier, blocks):
+    for block in blocks:
+        classifier(block)
+
+def blocks_per_second(classifier, blocks, repeat=5):
+    number = 1
+    while timeit.timeit(lambda: classify_all(classifier, blocks), number=number) < 0.2:
+        number *= 2
+    best = min(timeit.repeat(lambda: classify_all(classifier, blocks), number=number, repeat=repeat))
+    return len(blocks) * number / best
+
+def main():
+    blocks = BLOCKS * 1000
+    for block in BLOCKS:
+        if legacy_block_to_block_type(block) != block_to_block_type(block):
+            raise Exception(f"classifiers disagree on block {block!r}")
+    legacy_rate = blocks_per_second(legacy_block_to_block_type, blocks)
+    table_rate = blocks_per_second(block_to_block_type, blocks)
+    print(f"{'classifier':<12} {'blocks/sec':>14}")
+    print(f"{'legacy':<12} {legacy_rate:>14,.0f}")
+    print(f"{'table':<12} {table_rate:>14,.0f}")
+    print(f"speedup {table_rate / legacy_rate:.1f}x")
+
+if __name__ == "__main__":
+    main()
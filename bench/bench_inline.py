@@ -0,0 +1,38 @@
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from textnode import TextNode, TextType, split_nodes_delimiter, split_nodes_image, split_nodes_link, text_to_textnodes
+
+SENTENCE = "Some text with **bold words**, *italic words*, `inline code`, [a link](https://www.boot.dev/) and ![an image](/images/tom.png). "
+
+def legacy_text_to_textnodes(text):
+    text_nodes = [TextNode(text, TextType.TEXT)]
+    text_nodes = split_nodes_link(text_nodes)
+    text_nodes = split_nodes_image(text_nodes)
+    text_nodes = split_nodes_delimiter(text_nodes, "**", TextType.BOLD)
+    text_nodes = split_nodes_delimiter(text_nodes, "*", TextType.ITALIC)
+    text_nodes = split_nodes_delimiter(text_nodes, "_", TextType.ITALIC)
+    text_nodes = split_nodes_delimiter(text_nodes, "`", TextType.CODE)
+    return text_nodes
+
+def measure(function, text, repeat=5):
+    number = 1
+    while timeit.timeit(lambda: function(text), number=number) < 0.2:
+        number *= 2
+    return min(timeit.repeat(lambda: function(text), number=number, repeat=repeat)) / number
+
+def main():
+    print(f"{'sentences':>10} {'bytes':>10} {'legacy ms':>12} {'single pass ms':>15} {'speedup':>8}")
+    for sentences in (10, 100, 1000):
+        text = SENTENCE * sentences
+        if legacy_text_to_textnodes(text) != text_to_textnodes(text):
+            raise Exception("single pass tokenizer output differs from the legacy pipeline")
+        legacy_time = measure(legacy_text_to_textnodes, text)
+        single_pass_time = measure(text_to_textnodes, text)
+        print(f"{sentences:>10} {len(text):>10} {legacy_time * 1000:>12.3f} {single_pass_time * 1000:>15.3f} {legacy_time / single_pass_time:>7.1f}x")
+
+if __name__ == "__main__":
+    main()
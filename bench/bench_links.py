@@ -0,0 +1,65 @@
+import os
+import re
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from textnode import TextNode, TextType, split_nodes_image, split_nodes_link, extract_markdown_links
+
+LINK = "see [the docs](/docs/page) and ![a diagram](/images/diagram.png) "
+LEGACY_IMAGE_ALT_PATTERN = re.compile(r"!\[(.*?)\]")
+LEGACY_IMAGE_URL_PATTERN = re.compile(r"\((.*?)\)")
+
+def legacy_extract_markdown_images(text):
+    alt_text_list = LEGACY_IMAGE_ALT_PATTERN.findall(text)
+    url_list = LEGACY_IMAGE_URL_PATTERN.findall(text)
+    return [(alt_text_list[i], url_list[i]) for i in range(0, len(alt_text_list))]
+
+def legacy_split_nodes(old_nodes, extract, marker, text_type):
+    new_nodes = []
+    for node in old_nodes:
+        if not node.text:
+            continue
+        matches = extract(node.text)
+        node_text = node.text
+        if not matches or node.text_type != TextType.TEXT:
+            new_nodes.append(node)
+            continue
+        for i in range(0, len(matches)):
+            node_text_split = node_text.split(marker.format(*matches[i]), 1)
+            if node_text_split[0] != "":
+                new_nodes.append(TextNode(f"{node_text_split[0]}", TextType.TEXT))
+            new_nodes.append(TextNode(f"{matches[i][0]}", text_type, f"{matches[i][1]}"))
+            if i == len(matches) - 1 and node_text_split[1] != "":
+                new_nodes.append(TextNode(f"{node_text_split[1]}", TextType.TEXT))
+            node_text = node_text_split[1]
+    return new_nodes
+
+def legacy_split(text):
+    nodes = legacy_split_nodes([TextNode(text, TextType.TEXT)], extract_markdown_links, "[{}]({})", TextType.LINK)
+    return legacy_split_nodes(nodes, legacy_extract_markdown_images, "![{}]({})", TextType.IMAGE)
+
+def finditer_split(text):
+    return split_nodes_image(split_nodes_link([TextNode(text, TextType.TEXT)]))
+
+def measure(function, text, repeat=5):
+    number = 1
+    while timeit.timeit(lambda: function(text), number=number) < 0.2:
+        number *= 2
+    return min(timeit.repeat(lambda: function(text), number=number, repeat=repeat)) / number
+
+def main():
+    print(f"{'links':>8} {'bytes':>10} {'legacy ms':>11} {'legacy ns/link':>15} {'finditer ms':>12} {'finditer ns/link':>17}")
+    for pairs in (500, 1000, 2000, 4000, 8000):
+        text = LINK * pairs
+        if legacy_split(text) != finditer_split(text):
+            raise Exception("finditer split output differs from the legacy split")
+        links = pairs * 2
+        legacy_time = measure(legacy_split, text)
+        finditer_time = measure(finditer_split, text)
+        print(f"{links:>8} {len(text):>10} {legacy_time * 1000:>11.3f} {legacy_time * 1e9 / links:>15.1f} "
+              f"{finditer_time * 1000:>12.3f} {finditer_time * 1e9 / links:>17.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from block_markdown import markdown_to_html_node
+
+SECTION = """\
+## Section heading with **bold** text
+
+A paragraph with *italic words*, `inline code`, a [link](https://www.boot.dev/) and ![an image](/images/tom.png).
+Another line of the same paragraph with more **bold text** and a [second link](/blog/tom).
+
+* First item with a [link](/contact)
+* Second item with `code`
+
+> A quote with *emphasis*
+
+```
+for i in range(0, 10):
+    print(i)
+```
+
+"""
+
+def synthetic_markdown(size_bytes):
+    return "# Title\n\n" + SECTION * (size_bytes // len(SECTION) + 1)
+
+def peak_bytes(markdown):
+    tracemalloc.start()
+    html_node = markdown_to_html_node(markdown)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del html_node
+    return peak
+
+def main():
+    size_mb = float(sys.argv[1]) if len(sys.argv) > 1 else 1.0
+    markdown = synthetic_markdown(int(size_mb * 1024 * 1024))
+    markdown_mb = len(markdown.encode("utf-8")) / (1024 * 1024)
+    peak = peak_bytes(markdown)
+    print(f"markdown size: {markdown_mb:.2f} MB")
+    print(f"tracemalloc peak: {peak / (1024 * 1024):.2f} MB")
+    print(f"peak per MB of markdown: {peak / (1024 * 1024) / markdown_mb:.2f} MB")
+
+if __name__ == "__main__":
+    main()
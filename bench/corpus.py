@@ -0,0 +1,110 @@
+import os
+import random
+
+WORDS = (
+    "the static site generator turns markdown into html pages for the blog and "
+    "every page shares one template while images and styles are copied across "
+    "tolkien wrote about rivendell glorfindel and tom bombadil in the lord of the rings"
+).split()
+
+def words(rng, count):
+    return " ".join(rng.choice(WORDS) for _ in range(count))
+
+def inline_sentence(rng):
+    choice = rng.randrange(6)
+    if choice == 0:
+        return f"{words(rng, 6)} **{words(rng, 2)}** {words(rng, 4)}."
+    if choice == 1:
+        return f"{words(rng, 5)} *{words(rng, 2)}* {words(rng, 5)}."
+    if choice == 2:
+        return f"{words(rng, 4)} `{words(rng, 2)}` {words(rng, 6)}."
+    if choice == 3:
+        return f"{words(rng, 5)} [{words(rng, 2)}](/blog/{rng.choice(WORDS)}) {words(rng, 4)}."
+    if choice == 4:
+        return f"{words(rng, 3)} ![{words(rng, 2)}](/images/{rng.choice(WORDS)}.png) {words(rng, 5)}."
+    return f"{words(rng, 12)}."
+
+def long_paragraphs(size_bytes, seed=0):
+    rng = random.Random(seed)
+    parts = ["# Long paragraphs\n\n"]
+    size = len(parts[0])
+    while size < size_bytes:
+        paragraph = " ".join(inline_sentence(rng) for _ in range(40)) + "\n\n"
+        parts.append(paragraph)
+        size += len(paragraph)
+    return "".join(parts)
+
+def deep_lists(size_bytes, seed=0):
+    rng = random.Random(seed)
+    parts = ["# Deep lists\n\n"]
+    size = len(parts[0])
+    while size < size_bytes:
+        if rng.randrange(2):
+            items = [f"* {inline_sentence(rng)}" for _ in range(50)]
+        else:
+            items = [f"{number}. {inline_sentence(rng)}" for number in range(1, 51)]
+        block = "\n".join(items) + "\n\n"
+        parts.append(block)
+        size += len(block)
+    return "".join(parts)
+
+def huge_code_blocks(size_bytes, seed=0):
+    rng = random.Random(seed)
+    parts = ["# Code\n\n```\n"]
+    size = len(parts[0])
+    line_number = 0
+    while size < size_bytes:
+        line = f"    value_{line_number} = compute(\"{words(rng, 3)}\", {rng.randrange(1000)})\n"
+        parts.append(line)
+        size += len(line)
+        line_number += 1
+    parts.append("```\n")
+    return "".join(parts)
+
+def link_dense(size_bytes, seed=0):
+    rng = random.Random(seed)
+    parts = ["# Links\n\n"]
+    size = len(parts[0])
+    while size < size_bytes:
+        links = " ".join(f"[{rng.choice(WORDS)}](https://example.com/{rng.choice(WORDS)}/{index})" for index in range(200))
+        paragraph = links + "\n\n"
+        parts.append(paragraph)
+        size += len(paragraph)
+    return "".join(parts)
+
+def mixed_page(rng, index):
+    sections = [f"# Page {index}\n"]
+    for _ in range(rng.randrange(2, 6)):
+        sections.append(f"## {words(rng, 4)}")
+        sections.append(" ".join(inline_sentence(rng) for _ in range(rng.randrange(3, 12))))
+        block_type = rng.randrange(3)
+        if block_type == 0:
+            sections.append("\n".join(f"* {inline_sentence(rng)}" for _ in range(rng.randrange(2, 8))))
+        elif block_type == 1:
+            sections.append("> " + inline_sentence(rng))
+        else:
+            sections.append("```\n" + "\n".join(words(rng, 6) for _ in range(rng.randrange(2, 10))) + "\n```")
+    return "\n\n".join(sections) + "\n"
+
+def write_site(root_path, page_count, seed=0):
+    rng = random.Random(seed)
+    content_path = os.path.join(root_path, "content")
+    for index in range(page_count):
+        if index == 0:
+            page_directory = content_path
+        else:
+            page_directory = os.path.join(content_path, f"section{index % 20}", f"page{index}")
+        os.makedirs(page_directory, exist_ok=True)
+        with open(os.path.join(page_directory, "index.md"), "w") as page_file:
+            page_file.write(mixed_page(rng, index))
+    with open(os.path.join(root_path, "template.html"), "w") as template_file:
+        template_file.write("<html><head><title>{{ Title }}</title><link href=\"/index.css\"></head>"
+                            "<body><article>{{ Content }}</article></body></html>")
+    return content_path
+
+CORPORA = {
+    "long paragraphs": long_paragraphs,
+    "deep lists": deep_lists,
+    "huge code blocks": huge_code_blocks,
+    "link dense": link_dense,
+}
@@ -0,0 +1,114 @@
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from corpus import CORPORA, write_site
+from block_markdown import iter_markdown_blocks, block_to_block_type, append_block_nodes, markdown_to_html_node
+from parentnode import ParentNode
+from main import generate_multiple_pages
+
+def best_time(function, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        elapsed = time.perf_counter() - start
+        if best is None or elapsed < best:
+            best = elapsed
+    return best
+
+def stage_functions(markdown):
+    blocks = list(iter_markdown_blocks(markdown))
+    block_types = [block_to_block_type(block) for block in blocks]
+    html_node = markdown_to_html_node(markdown)
+
+    def inline_parse():
+        block_nodes = []
+        for block, block_type in zip(blocks, block_types):
+            append_block_nodes(block_nodes, block, block_type)
+        return ParentNode("div", block_nodes)
+
+    return {
+        "block split": lambda: list(iter_markdown_blocks(markdown)),
+        "block classify": lambda: [block_to_block_type(block) for block in blocks],
+        "inline parse": inline_parse,
+        "serialize": html_node.to_html,
+        "end to end": lambda: markdown_to_html_node(markdown).to_html(),
+    }
+
+def benchmark_corpora(size_bytes, repeat, seed):
+    results = {}
+    for corpus_name, generate in CORPORA.items():
+        markdown = generate(size_bytes, seed)
+        size_mb = len(markdown.encode("utf-8")) / (1024 * 1024)
+        for stage_name, function in stage_functions(markdown).items():
+            seconds = best_time(function, repeat)
+            results[f"{corpus_name}/{stage_name}"] = {"seconds": seconds, "unit": "MB/s", "throughput": size_mb / seconds}
+    return results
+
+def benchmark_site(page_count, repeat, seed, jobs):
+    with tempfile.TemporaryDirectory() as root_path:
+        content_path = write_site(root_path, page_count, seed)
+        dest_path = os.path.join(root_path, "docs")
+        seconds = best_time(lambda: generate_multiple_pages(content_path, root_path, dest_path, "/", jobs=jobs), repeat)
+    return {f"site {page_count} pages/build": {"seconds": seconds, "unit": "pages/s", "throughput": page_count / seconds}}
+
+def compare(results, baseline, threshold):
+    regressions = []
+    print(f"{'benchmark':<40} {'throughput':>14} {'baseline':>14} {'change':>8}")
+    for name, result in results.items():
+        line = f"{name:<40} {result['throughput']:>9.2f} {result['unit']:<4}"
+        if name in baseline:
+            baseline_throughput = baseline[name]["throughput"]
+            change = result["throughput"] / baseline_throughput - 1
+            line += f" {baseline_throughput:>9.2f} {result['unit']:<4} {change * 100:>+7.1f}%"
+            if change < -threshold:
+                regressions.append(name)
+                line += "  REGRESSION"
+        print(line)
+    return regressions
+
+def parse_arguments(program_arguments):
+    parser = argparse.ArgumentParser(description="Benchmark the markdown pipeline on synthetic corpora")
+    parser.add_argument("--size", type=float, default=1.0, help="size of each synthetic document in MB")
+    parser.add_argument("--pages", type=int, default=1000, help="number of pages in the synthetic site")
+    parser.add_argument("--jobs", type=int, default=1, help="worker processes for the site build")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per benchmark, the fastest is kept")
+    parser.add_argument("--seed", type=int, default=0, help="seed for the corpus generator")
+    parser.add_argument("--output", help="write the results to this JSON file")
+    parser.add_argument("--baseline", help="compare against results saved with --output")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="fractional throughput drop that counts as a regression")
+    return parser.parse_args(program_arguments)
+
+def main():
+    arguments = parse_arguments(sys.argv[1:])
+    results = benchmark_corpora(int(arguments.size * 1024 * 1024), arguments.repeat, arguments.seed)
+    results.update(benchmark_site(arguments.pages, arguments.repeat, arguments.seed, arguments.jobs))
+
+    baseline = {}
+    if arguments.baseline is not None:
+        with open(arguments.baseline) as baseline_file:
+            baseline = json.load(baseline_file)["results"]
+    regressions = compare(results, baseline, arguments.threshold)
+
+    if arguments.output is not None:
+        with open(arguments.output, "w") as output_file:
+            json.dump({
+                "python": platform.python_version(),
+                "machine": platform.machine(),
+                "arguments": vars(arguments),
+                "results": results,
+            }, output_file, indent=1)
+    if regressions:
+        print(f"\n{len(regressions)} benchmarks regressed by more than {arguments.threshold * 100:.0f}%")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+from concurrent.futures import ThreadPoolExecutor
+from manifest import hash_bytes, hash_file, file_signature
+from output import write_output
+from static_sync import list_files, sync_files
+from urls import URLRewriter, IDENTITY_REWRITER
+import json
+import os
+import posixpath
+import re
+
+ASSET_MANIFEST_FILE = "assets.json"
+ASSET_MANIFEST_SOURCE = "asset manifest"
+FINGERPRINT_LENGTH = 8
+UNFINGERPRINTED_FILES = ("robots.txt", "favicon.ico")
+UNFINGERPRINTED_EXTENSIONS = (".html",)
+ASSET_URL_PATTERN = re.compile(r"/([^?#]*)(.*)", re.DOTALL)
+
+class FingerprintRewriter(URLRewriter):
+    def __init__(self, assets, url_rewriter=IDENTITY_REWRITER):
+        self.assets = assets
+        self.url_rewriter = url_rewriter
+        self.key = f"{url_rewriter.key};assets:{hash_bytes(*(f'{name}={path}' for name, path in sorted(assets.items())))}"
+
+    def __call__(self, url):
+        match = ASSET_URL_PATTERN.fullmatch(url)
+        if match is not None and match.group(1) in self.assets:
+            url = f"/{self.assets[match.group(1)]}{match.group(2)}"
+        return self.url_rewriter(url)
+
+def fingerprint_static(source_path, destination_path, manifest=None, url_rewriter=IDENTITY_REWRITER, link=False, workers=1):
+    asset_manifest_path = os.path.join(destination_path, ASSET_MANIFEST_FILE)
+    previous_assets = load_assets(asset_manifest_path)
+    assets = {}
+    unhashed = []
+    for source_file_path in list_files(source_path):
+        name = os.path.relpath(source_file_path, source_path).replace(os.sep, "/")
+        signature = file_signature(source_file_path)
+        previous = previous_assets.get(name)
+        if previous is not None and previous.get("signature") == signature:
+            assets[name] = previous
+        else:
+            unhashed.append((name, source_file_path, signature))
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        digests = executor.map(hash_file, [source_file_path for _, source_file_path, _ in unhashed])
+        for (name, _, signature), digest in zip(unhashed, digests):
+            assets[name] = {"path": fingerprinted_name(name, digest), "signature": signature, "hash": digest}
+    assets = dict(sorted(assets.items()))
+
+    if manifest is not None:
+        for name, previous in previous_assets.items():
+            if name not in assets or assets[name]["path"] != previous["path"]:
+                manifest.remove_output(os.path.join(destination_path, *previous["path"].split("/")))
+    files = [(os.path.join(source_path, *name.split("/")), os.path.join(destination_path, *asset["path"].split("/")))
+             for name, asset in assets.items()]
+    sync_files(files, manifest, link=link, workers=workers)
+    write_output(asset_manifest_path, json.dumps(assets, indent=1) + "\n")
+    if manifest is not None:
+        manifest.record(ASSET_MANIFEST_SOURCE, asset_manifest_path, file_signature(asset_manifest_path))
+    return FingerprintRewriter({name: asset["path"] for name, asset in assets.items()}, url_rewriter)
+
+def load_assets(asset_manifest_path):
+    try:
+        with open(asset_manifest_path, encoding="utf-8") as asset_manifest_file:
+            return json.load(asset_manifest_file)
+    except (OSError, ValueError):
+        return {}
+
+def fingerprinted_name(name, digest):
+    directory, file_name = posixpath.split(name)
+    stem, extension = posixpath.splitext(file_name)
+    if file_name in UNFINGERPRINTED_FILES or extension in UNFINGERPRINTED_EXTENSIONS:
+        return name
+    return posixpath.join(directory, f"{stem}.{digest[:FINGERPRINT_LENGTH]}{extension}")
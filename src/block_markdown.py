@@ -1,15 +1,70 @@
+import io
 import re
 from textnode import TextType, TextNode, text_node_to_html_node, text_to_textnodes
 from leafnode import LeafNode
 from parentnode import ParentNode
+from urls import IDENTITY_REWRITER
+
+CODE_FENCE = "```"
+HEADING_TAGS = ("h1", "h2", "h3", "h4", "h5", "h6")
+SUMMARY_LIMIT = 280
+TITLE_PATTERN = re.compile(r"^# (.*)", re.MULTILINE)
+HEADING_PATTERN = re.compile(r"#{1,6}(?= )")
+HEADING_HASHES_PATTERN = re.compile(r"^(#+) ")
+CODE_BLOCK_PATTERN = re.compile(r"^`{3}[\s\S]*`{3}$")
+QUOTE_BLOCK_PATTERN = re.compile(r"^(>.*\n?)*$", re.MULTILINE)
+UNORDERED_LIST_PATTERN = re.compile(r"^([-*] .*\n?)*$", re.MULTILINE)
+ORDERED_LIST_PATTERN = re.compile(r"^([0-9]+. .*\n?)*$", re.MULTILINE)
+QUOTE_MARKER_PATTERN = re.compile(r"^([>])+")
+ORDERED_LIST_MARKER_PATTERN = re.compile(r"^([0-9])+. ")
+UNORDERED_LIST_MARKER_PATTERN = re.compile(r"^[-*] ")
+NEWLINE_SPLIT_PATTERN = re.compile(r"(\n)")
+
+BLOCK_CLASSIFIERS = {
+    "#": ("heading", HEADING_PATTERN.match),
+    "`": ("code", CODE_BLOCK_PATTERN.match),
+    ">": ("quote", QUOTE_BLOCK_PATTERN.fullmatch),
+    "-": ("unordered list", UNORDERED_LIST_PATTERN.fullmatch),
+    "*": ("unordered list", UNORDERED_LIST_PATTERN.fullmatch),
+}
+for digit in "0123456789":
+    BLOCK_CLASSIFIERS[digit] = ("ordered list", ORDERED_LIST_PATTERN.fullmatch)
+
+BLOCK_LINE_MARKERS = {
+    "heading": HEADING_HASHES_PATTERN,
+    "quote": QUOTE_MARKER_PATTERN,
+    "unordered list": UNORDERED_LIST_MARKER_PATTERN,
+    "ordered list": ORDERED_LIST_MARKER_PATTERN,
+}
 
 def extract_title(markdown):
-    match = re.search(r"^#{1} .*", markdown, re.MULTILINE)
+    match = TITLE_PATTERN.search(markdown)
     if match:
-        return match.group(0)[2:].strip()
+        return match.group(1).strip()
     else:
         raise Exception("No header found")
         
+def extract_summary(markdown, limit=SUMMARY_LIMIT):
+    for block in iter_markdown_blocks(markdown):
+        if block_to_block_type(block) == "normal":
+            summary = " ".join("".join(node.text for node in text_to_textnodes(line)) for line in block.split("\n"))
+            if len(summary) > limit:
+                summary = summary[:limit].rsplit(" ", 1)[0] + "…"
+            return summary
+    return ""
+
+def iter_text_nodes(markdown):
+    for block in iter_markdown_blocks(markdown):
+        block_type = block_to_block_type(block)
+        if block_type == "code":
+            yield TextNode(block[4:-4], TextType.CODE)
+            continue
+        marker_pattern = BLOCK_LINE_MARKERS.get(block_type)
+        for line in block.split("\n"):
+            if marker_pattern is not None:
+                line = marker_pattern.sub("", line)
+            yield from text_to_textnodes(line.strip())
+
 def markdown_to_blocks(markdown):
     markdown_split = markdown.split("\n\n")
     string_list = []
@@ -20,76 +75,76 @@ def markdown_to_blocks(markdown):
             string_list.append(string)
     return string_list
 
-def markdown_to_blocks_smart(markdown):
-    markdown_split = markdown.split("\n\n")
-    code_contents = check_for_code_blocks(markdown)
-    code_contents_index = 0
-    inside_code_block = False
-    string_list = []
-    for i in range(0, len(markdown_split)):
-        string = markdown_split[i]
-        if string != "" and string != "```" and not inside_code_block:
-            string = string.strip("\n")
-            string = string.strip()
-            string_list.append(string)
-        elif string == "```" and not inside_code_block:
-            inside_code_block = True
-            string_list.append("```" + code_contents[code_contents_index] + "\n```")
-        elif string == "```" and inside_code_block:
-            inside_code_block = False
-            code_contents_index += 1
-    return string_list
+def iter_markdown_blocks(lines):
+    if isinstance(lines, str):
+        lines = io.StringIO(lines)
+    block_lines = []
+    code_lines = None
+    for line in lines:
+        line = line.rstrip("\r\n")
+        if code_lines is not None:
+            if line.strip() == CODE_FENCE:
+                yield code_block(code_lines)
+                code_lines = None
+            else:
+                code_lines.append(line)
+        elif line.startswith(CODE_FENCE) and "`" not in line[len(CODE_FENCE):]:
+            if block_lines:
+                yield text_block(block_lines)
+                block_lines = []
+            code_lines = []
+        elif line.strip() == "":
+            if block_lines:
+                yield text_block(block_lines)
+                block_lines = []
+        else:
+            block_lines.append(line)
+    if code_lines is not None:
+        yield code_block(code_lines)
+    elif block_lines:
+        yield text_block(block_lines)
 
-def check_for_code_blocks(markdown):
-    split_by_code_lines = markdown.split("\n```")
-    code_contents = []
-    for i in range(0, len(split_by_code_lines)):
-        if i % 2 == 1 and i < len(split_by_code_lines) - 1:
-            code_contents.append(split_by_code_lines[i])
-    return code_contents
+def text_block(lines):
+    return "\n".join(lines).strip()
+
+def code_block(lines):
+    return f"{CODE_FENCE}\n" + "\n".join(lines) + f"\n{CODE_FENCE}"
 
 def block_to_block_type(markdown):
-    if re.match(r"#{1,6}(?= )", markdown):
-        return "heading"
-    elif re.match(r"^`{3}[\s\S]*`{3}$", markdown):
-        return "code"
-    elif re.fullmatch(r"^(>.*\n?)*$", markdown, re.MULTILINE):
-        return "quote"
-    elif re.fullmatch(r"^([-*] .*\n?)*$", markdown, re.MULTILINE):
-        return "unordered list"
-    elif re.fullmatch(r"^([0-9]+. .*\n?)*$", markdown, re.MULTILINE):
-        return "ordered list"
-    else:
-        return "normal"
+    classifier = BLOCK_CLASSIFIERS.get(markdown[:1])
+    if classifier is not None and classifier[1](markdown):
+        return classifier[0]
+    return "normal"
 
-def markdown_to_html_node(markdown):
-    split_document = markdown_to_blocks_smart(markdown)
+def markdown_to_html_node(markdown, url_rewriter=IDENTITY_REWRITER):
     block_nodes = []
-    for block in split_document:
-        block_type = block_to_block_type(block)
-        match block_type:
-            case "heading": 
-                block_nodes.append(create_header_node(block))
-            case "code":
-                block_nodes.append(create_code_node(block))
-            case "quote":
-                block_nodes.append(create_quote_node(block))
-            case "unordered list":
-                block_nodes.append(create_unordered_list_node(block))
-            case "ordered list":
-                block_nodes.append(create_ordered_list_node(block))
-            case "normal":
-                block_nodes.extend(create_paragraph_node(block))
+    for block in iter_markdown_blocks(markdown):
+        append_block_nodes(block_nodes, block, block_to_block_type(block), url_rewriter)
     return ParentNode("div", block_nodes)
+
+def append_block_nodes(block_nodes, block, block_type, url_rewriter=IDENTITY_REWRITER):
+    match block_type:
+        case "heading": 
+            block_nodes.append(create_header_node(block, url_rewriter))
+        case "code":
+            block_nodes.append(create_code_node(block))
+        case "quote":
+            block_nodes.append(create_quote_node(block, url_rewriter))
+        case "unordered list":
+            block_nodes.append(create_unordered_list_node(block, url_rewriter))
+        case "ordered list":
+            block_nodes.append(create_ordered_list_node(block, url_rewriter))
+        case "normal":
+            block_nodes.extend(create_paragraph_node(block, url_rewriter))
             
-def create_header_node(block):
-    header_match = re.match(r"^(#+) ", block)
-    hash_count = len(list(header_match.group(1)))
-    children_nodes = text_to_children(block[hash_count+1:])
-    return ParentNode(f"h{hash_count}", children_nodes)
+def create_header_node(block, url_rewriter=IDENTITY_REWRITER):
+    header_match = HEADING_HASHES_PATTERN.match(block)
+    hash_count = len(header_match.group(1))
+    children_nodes = text_to_children(block[hash_count+1:], url_rewriter)
+    return ParentNode(HEADING_TAGS[hash_count - 1], children_nodes)
 
 def create_code_node(block): 
-    lines = re.split(r"(\n)", block[4:-4])
+    lines = NEWLINE_SPLIT_PATTERN.split(block[4:-4])
     children_nodes = []
     for line in lines:
         if line != "\n":
@@ -99,44 +154,44 @@ def create_code_node(block):
             children_nodes[-1].value += "<br>"       
     return ParentNode("pre", children_nodes)
 
-def create_quote_node(block):
+def create_quote_node(block, url_rewriter=IDENTITY_REWRITER):
     lines = block.split("\n")
     children_nodes = []
     i = 0
     for line in lines:
-        line = re.sub(r"^([>])+", "", line)
+        line = QUOTE_MARKER_PATTERN.sub("", line)
         line = line.lstrip()
         if i != len(lines) - 1:
             line += " "
-        children_nodes.extend(text_to_children(line))
+        children_nodes.extend(text_to_children(line, url_rewriter))
         i += 1
     return ParentNode("blockquote", children_nodes)
 
-def create_unordered_list_node(block):
+def create_unordered_list_node(block, url_rewriter=IDENTITY_REWRITER):
     lines = block.split("\n")
     children_nodes = []
     for line in lines:
-        children_nodes.append(ParentNode("li", text_to_children(line[2:]))) 
+        children_nodes.append(ParentNode("li", text_to_children(line[2:], url_rewriter))) 
     return ParentNode("ul", children_nodes)
 
-def create_ordered_list_node(block):
+def create_ordered_list_node(block, url_rewriter=IDENTITY_REWRITER):
     lines = block.split("\n")
     children_nodes = []
     for line in lines:
-        line = re.sub(r"^([0-9])+. ", "", line)
-        children_nodes.append(ParentNode("li", text_to_children(line)))
+        line = ORDERED_LIST_MARKER_PATTERN.sub("", line)
+        children_nodes.append(ParentNode("li", text_to_children(line, url_rewriter)))
     return ParentNode("ol", children_nodes)
 
-def create_paragraph_node(block):
+def create_paragraph_node(block, url_rewriter=IDENTITY_REWRITER):
     lines = block.split("\n")
     children_nodes = []
     for line in lines:
-        children_nodes.append(ParentNode("p", text_to_children(line)))
+        children_nodes.append(ParentNode("p", text_to_children(line, url_rewriter)))
     return children_nodes
 
-def text_to_children(line):
+def text_to_children(line, url_rewriter=IDENTITY_REWRITER):
     children_nodes = []
     text_nodes = text_to_textnodes(line)
     for text_node in text_nodes:
-        children_nodes.append(text_node_to_html_node(text_node))
+        children_nodes.append(text_node_to_html_node(text_node, url_rewriter))
     return children_nodes
\ No newline at end of file
@@ -0,0 +1,87 @@
+import json
+import logging
+import os
+import socket
+import socketserver
+import stat
+
+BUILD_COMMANDS = ("build", "ping", "shutdown")
+
+logger = logging.getLogger(__name__)
+
+class BuildRequestHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        for line in self.rfile:
+            try:
+                command = json.loads(line).get("command")
+            except ValueError:
+                command = None
+            response = self.server.respond(command)
+            self.wfile.write(json.dumps(response).encode("utf-8") + b"\n")
+            self.wfile.flush()
+            if not self.server.running:
+                return
+
+class BuildServer(socketserver.UnixStreamServer):
+    def __init__(self, socket_path, builder):
+        remove_stale_socket(socket_path)
+        self.builder = builder
+        self.running = True
+        super().__init__(socket_path, BuildRequestHandler)
+
+    def respond(self, command):
+        if command == "build":
+            try:
+                return {"ok": True, **self.builder.build()}
+            except Exception as error:
+                logger.error(f"build failed: {error}")
+                return {"ok": False, "error": str(error)}
+        if command == "ping":
+            return {"ok": True}
+        if command == "shutdown":
+            self.running = False
+            return {"ok": True}
+        return {"ok": False, "error": f"unknown command {command}, expected one of {', '.join(BUILD_COMMANDS)}"}
+
+    def serve(self):
+        while self.running:
+            self.handle_request()
+
+    def server_close(self):
+        super().server_close()
+        if os.path.exists(self.server_address):
+            os.remove(self.server_address)
+
+def remove_stale_socket(socket_path):
+    try:
+        mode = os.stat(socket_path).st_mode
+    except FileNotFoundError:
+        return
+    if not stat.S_ISSOCK(mode):
+        raise Exception(f"{socket_path} exists and is not a socket")
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        try:
+            client.connect(socket_path)
+        except ConnectionRefusedError:
+            logger.info(f"removing stale socket {socket_path}")
+            os.remove(socket_path)
+            return
+    raise Exception(f"a build server is already listening on {socket_path}")
+
+def serve_builds(socket_path, builder):
+    with BuildServer(socket_path, builder) as server:
+        logger.info(f"waiting for build requests on {socket_path}")
+        try:
+            server.serve()
+        except KeyboardInterrupt:
+            logger.info("stopped serving")
+
+def request_build(socket_path, command="build"):
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        client.connect(socket_path)
+        client.sendall(json.dumps({"command": command}).encode("utf-8") + b"\n")
+        with client.makefile("rb") as response_file:
+            response = response_file.readline()
+    if not response:
+        raise Exception(f"no reply from the build server on {socket_path}")
+    return json.loads(response)
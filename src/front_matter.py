@@ -0,0 +1,80 @@
+from block_markdown import TITLE_PATTERN
+import itertools
+import re
+
+FRONT_MATTER_SEPARATORS = {"---": ":", "+++": "="}
+INTEGER_PATTERN = re.compile(r"-?[0-9]+")
+
+def split_front_matter(markdown):
+    delimiter = markdown[:3]
+    if delimiter not in FRONT_MATTER_SEPARATORS or markdown[3:4] not in ("\n", "\r"):
+        return {}, markdown
+    position = markdown.find(f"\n{delimiter}", 3)
+    while position != -1:
+        line_end = markdown.find("\n", position + 4)
+        if line_end == -1:
+            line_end = len(markdown)
+        if not markdown[position + 4:line_end].strip():
+            metadata = parse_front_matter(markdown[4:position].splitlines(), FRONT_MATTER_SEPARATORS[delimiter])
+            return metadata, markdown[line_end + 1:]
+        position = markdown.find(f"\n{delimiter}", line_end)
+    raise Exception(f"unterminated front matter, expected a closing {delimiter}")
+
+def read_metadata(markdown_path):
+    with open(markdown_path, encoding="utf-8") as markdown_file:
+        first_line = markdown_file.readline()
+        delimiter = first_line.rstrip()
+        metadata = {}
+        body_lines = itertools.chain([first_line], markdown_file)
+        if delimiter in FRONT_MATTER_SEPARATORS:
+            header_lines = []
+            for line in markdown_file:
+                if line.rstrip() == delimiter:
+                    break
+                header_lines.append(line)
+            else:
+                raise Exception(f"unterminated front matter, expected a closing {delimiter}")
+            metadata = parse_front_matter(header_lines, FRONT_MATTER_SEPARATORS[delimiter])
+            body_lines = markdown_file
+        if "title" not in metadata:
+            for line in body_lines:
+                match = TITLE_PATTERN.match(line)
+                if match:
+                    metadata["title"] = match.group(1).strip()
+                    break
+    return metadata
+
+def parse_front_matter(lines, separator):
+    metadata = {}
+    list_key = None
+    for line in lines:
+        stripped = line.strip()
+        if not stripped or stripped[0] == "#":
+            continue
+        if list_key is not None and stripped[:2] == "- ":
+            metadata[list_key].append(parse_value(stripped[2:]))
+            continue
+        key, found, value = stripped.partition(separator)
+        if not found:
+            raise Exception(f"invalid front matter line: {stripped}")
+        key = key.strip()
+        value = value.strip()
+        if value:
+            metadata[key] = parse_value(value)
+            list_key = None
+        else:
+            metadata[key] = []
+            list_key = key
+    return metadata
+
+def parse_value(value):
+    if value[:1] == "[" and value[-1:] == "]":
+        return [parse_value(item) for item in value[1:-1].split(",") if item.strip()]
+    value = value.strip()
+    if len(value) >= 2 and value[0] == value[-1] and value[0] in "\"'":
+        return value[1:-1]
+    if value in ("true", "false"):
+        return value == "true"
+    if INTEGER_PATTERN.fullmatch(value):
+        return int(value)
+    return value
@@ -1,4 +1,8 @@
+import io
+
 class HTMLNode:
+    __slots__ = ("tag", "value", "children", "props")
+
     def __init__(self, tag=None, value=None, children=None, props=None):
         self.tag = tag
         self.value = value
@@ -6,15 +10,17 @@ class HTMLNode:
         self.props = props
 
     def to_html(self):
+        buffer = io.StringIO()
+        self.write_html(buffer)
+        return buffer.getvalue()
+
+    def write_html(self, fp):
         raise NotImplementedError("Not implemented")
 
     def props_to_html(self):
         if self.props == None:
             return ""
-        html_string = ""
-        for attribute in self.props:
-            html_string += f" {attribute}=\"{self.props[attribute]}\""
-        return html_string
+        return "".join([f" {attribute}=\"{value}\"" for attribute, value in self.props.items()])
     
     def __repr__(self):
         return f"HTMLNode({self.tag}, {self.value}, {self.children}, {self.props})"
@@ -1,14 +1,17 @@
 from htmlnode import HTMLNode
 
 class LeafNode(HTMLNode):
+    __slots__ = ()
+
     def __init__(self, tag, value, props=None):
         super().__init__(tag, value, None, props)
 
-    def to_html(self):
+    def write_html(self, fp):
         if self.value == None:
             raise ValueError("leaf node must have a value")
         if self.tag == None:
-            return self.value
+            fp.write(self.value)
         else:
-            html_string = f"<{self.tag}{self.props_to_html()}>{self.value}</{self.tag}>"
-            return html_string
\ No newline at end of file
+            fp.write(f"<{self.tag}{self.props_to_html()}>")
+            fp.write(self.value)
+            fp.write(f"</{self.tag}>")
\ No newline at end of file
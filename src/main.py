@@ -1,90 +1,544 @@
 from textnode import TextNode, TextType
-from block_markdown import extract_title, markdown_to_html_node
+from block_markdown import extract_title, extract_summary, markdown_to_html_node, iter_markdown_blocks, block_to_block_type, append_block_nodes
 from parentnode import ParentNode
+from template import TemplateIndex, TEMPLATE_EXTENSION
+from front_matter import split_front_matter, read_metadata
+from urls import BasePathRewriter, IDENTITY_REWRITER
+from manifest import hash_bytes, file_signature, signature_mtime, load_manifest
+from site_index import write_site_indexes
+from search_index import write_search_index
+from static_sync import sync_static, sync_static_file
+from assets import fingerprint_static
+from output import staging_path, prepare_staging, swap_staging
+from render_cache import RenderCache, CACHE_DIRECTORY, DEFAULT_MAX_BYTES
+from watch import PollingWatcher, is_within
+from build_server import serve_builds, request_build, BUILD_COMMANDS
+from profiler import BuildProfiler, DISABLED_PROFILER
+from pipeline import WriteQueue, bounded_map, DEFAULT_IO_WORKERS, DEFAULT_QUEUE_DEPTH
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+import argparse
+import json
+import logging
 import os
 import sys
-import shutil
-
-def copy_files(source_path, destination_path):
-    if not os.path.exists(destination_path):
-        os.mkdir(destination_path)
-    for item in os.listdir(source_path):
-        new_source_path = os.path.join(source_path, item)
-        new_destination_path = os.path.join(destination_path, item)
-        if os.path.isfile(new_source_path):
-            print(f"\nCopying {item} from {source_path} to {destination_path}")
-            shutil.copy(new_source_path, new_destination_path)
-        else:
-            print(f"\nlooking in {new_source_path}")
-            if not os.path.exists(new_destination_path):
-                os.mkdir(new_destination_path)
-            copy_files(new_source_path, new_destination_path)
-    return
-
-def generate_multiple_pages(from_path, template_path, dest_path, base_path):
-    for item in os.listdir(from_path):
-        new_from_path = os.path.join(from_path, item)
-        new_dest_path = os.path.join(dest_path, item)
-        if os.path.isfile(new_from_path):
-            print(f"\nGenerating html page from {new_from_path}")
-            generate_page(from_path, template_path, dest_path, base_path)
+import time
+
+WATCH_INTERVAL = 0.25
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_CACHE_PATH = os.path.join(PROJECT_ROOT, CACHE_DIRECTORY)
+LOG_LEVELS = ("debug", "info", "warning", "error")
+
+logger = logging.getLogger(__name__)
+
+def generate_multiple_pages(from_path, template_path, dest_path, base_path, manifest=None, jobs=1, render_cache=None,
+                            profiler=DISABLED_PROFILER, io_workers=DEFAULT_IO_WORKERS, drafts=False):
+    with profiler.stage("discovery"):
+        pages = discover_pages(from_path, dest_path)
+    with profiler.stage("template index"):
+        templates = TemplateIndex(template_path, from_path, BasePathRewriter(base_path))
+    return generate_pages(pages, templates, manifest, jobs, render_cache, profiler, io_workers, drafts)
+
+def generate_pages(pages, templates, manifest=None, jobs=1, render_cache=None, profiler=DISABLED_PROFILER,
+                   io_workers=DEFAULT_IO_WORKERS, drafts=False, executor=None):
+    start_time = time.perf_counter()
+    url_rewriter = templates.url_rewriter
+    page_count = 0
+    cached_count = 0
+    errors = []
+    writer = WriteQueue(io_workers, profiler=profiler)
+
+    def stale_pages():
+        nonlocal page_count
+        for markdown_path, output_path in pages:
+            try:
+                markdown_signature = file_signature(markdown_path)
+            except OSError as error:
+                page_count += 1
+                errors.append(f"{markdown_path}: {error}")
+                continue
+            if manifest is None:
+                yield markdown_path, output_path, markdown_signature, "no manifest"
+                continue
+            if not drafts and manifest.metadata(output_path).get("draft") is True:
+                yield markdown_path, output_path, markdown_signature, "drafts are excluded"
+                continue
+            recorded_template = manifest.metadata(output_path).get("template")
+            if recorded_template not in templates.templates:
+                recorded_template = None
+            dependencies = page_dependencies(markdown_path, markdown_signature, templates.resolve(markdown_path, recorded_template))
+            reason = manifest.stale_reason(output_path, dependencies, url_rewriter.key)
+            if reason is not None:
+                yield markdown_path, output_path, markdown_signature, reason
+
+    def page_dependencies(markdown_path, markdown_signature, template_name):
+        template_file_path, template_signature, _ = templates.files[template_name]
+        return {markdown_path: markdown_signature, template_file_path: template_signature}
+
+    def pending_tasks():
+        nonlocal page_count, cached_count
+        with ThreadPoolExecutor(max_workers=io_workers) as reader:
+            read_page = partial(read_page_profiled, profiler=profiler)
+            for page, markdown, error in bounded_map(reader, read_page, stale_pages(), DEFAULT_QUEUE_DEPTH):
+                markdown_path, output_path, markdown_signature, reason = page
+                try:
+                    if error is not None:
+                        raise error
+                    metadata, body = split_front_matter(markdown)
+                    if metadata.get("draft") is True and not drafts:
+                        logger.debug(f"Skipping draft {markdown_path}")
+                        if manifest is not None:
+                            manifest.remove_output(output_path)
+                        continue
+                    template_name = templates.resolve(markdown_path, metadata.get("template"))
+                    page_metadata = {
+                        **metadata,
+                        "title": metadata.get("title") or extract_title(body),
+                        "summary": extract_summary(body),
+                        "modified": signature_mtime(markdown_signature),
+                    }
+                except Exception as error:
+                    page_count += 1
+                    errors.append(f"{markdown_path}: {error}")
+                    continue
+                template = templates.templates[template_name]
+                dependencies = page_dependencies(markdown_path, markdown_signature, template_name)
+                digest = hash_bytes(markdown, templates.files[template_name][2], url_rewriter.key)
+                if manifest is not None and manifest.is_current(output_path, digest):
+                    manifest.record(markdown_path, output_path, digest, dependencies, url_rewriter.key, metadata=page_metadata)
+                    continue
+                page_count += 1
+                tag = (markdown_path, output_path, digest, dependencies, reason, page_metadata)
+                cached_render = render_cache.get(markdown, url_rewriter.key) if render_cache is not None else None
+                if cached_render is not None:
+                    title, content_html = cached_render
+                    variables = {**metadata_variables(metadata), "Title": title, "Content": content_html}
+                    writer.put(tag, output_path, template.render(variables))
+                    cached_count += 1
+                    continue
+                logger.debug(f"Generating html page from {markdown_path}: {reason}")
+                yield tag, markdown, template
+
+    def record_writes(results):
+        for (markdown_path, output_path, digest, dependencies, reason, metadata), error in results:
+            if error is not None:
+                errors.append(f"{markdown_path}: {error}")
+            elif manifest is not None:
+                manifest.record(markdown_path, output_path, digest, dependencies, url_rewriter.key, reason, metadata)
+
+    keep_content = render_cache is not None
+    try:
+        for (tag, markdown, _), result, error in run_page_tasks(pending_tasks(), jobs, keep_content, profiler.enabled, executor):
+            if error is not None:
+                errors.append(f"{tag[0]}: {error}")
+                continue
+            title, content_html, webpage, events = result
+            profiler.merge(events)
+            writer.put(tag, tag[1], webpage)
+            if render_cache is not None:
+                render_cache.put(markdown, url_rewriter.key, title, content_html)
+            record_writes(writer.finished())
+    finally:
+        record_writes(writer.close())
+    if render_cache is not None:
+        render_cache.commit()
+    elapsed = time.perf_counter() - start_time
+    rate = page_count / elapsed if elapsed > 0 else 0.0
+    logger.info(f"Generated {page_count - len(errors)} of {len(pages)} pages in {elapsed:.2f}s ({rate:.1f} pages/sec), "
+                f"{cached_count} from the render cache")
+    if errors:
+        raise Exception(f"{len(errors)} of {page_count} pages failed to generate:\n" + "\n".join(errors))
+    return page_count
+
+def scan_metadata(pages, io_workers=DEFAULT_IO_WORKERS):
+    with ThreadPoolExecutor(max_workers=io_workers) as reader:
+        for (markdown_path, output_path), metadata, error in bounded_map(reader, read_page_metadata, pages, DEFAULT_QUEUE_DEPTH):
+            yield markdown_path, output_path, metadata, error
+
+def read_page_metadata(page):
+    return read_metadata(page[0])
+
+def read_page_profiled(page, profiler=DISABLED_PROFILER):
+    with profiler.stage("read", page[1]):
+        return read_markdown_file(page[0])
+
+def discover_pages(from_path, dest_path):
+    pages = []
+    sources = {}
+    directories = [(from_path, dest_path)]
+    while directories:
+        directory_path, directory_dest_path = directories.pop()
+        with os.scandir(directory_path) as entries:
+            entries = sorted(entries, key=lambda entry: entry.name)
+        subdirectories = []
+        for entry in entries:
+            if entry.is_dir():
+                subdirectories.append((entry.path, os.path.join(directory_dest_path, entry.name)))
+            elif entry.is_file() and entry.name[-3:] == ".md":
+                output_path = page_output_path(entry.name, directory_dest_path)
+                if output_path in sources:
+                    raise Exception(f"{sources[output_path]} and {entry.path} both generate {output_path}")
+                sources[output_path] = entry.path
+                pages.append((entry.path, output_path))
+        directories.extend(reversed(subdirectories))
+    return pages
+
+def content_output_path(markdown_path, from_path, dest_path):
+    relative_directory = os.path.relpath(os.path.dirname(markdown_path), from_path)
+    return page_output_path(os.path.basename(markdown_path), os.path.normpath(os.path.join(dest_path, relative_directory)))
+
+def page_output_path(markdown_name, dest_path):
+    if markdown_name == "index.md":
+        return os.path.join(dest_path, "index.html")
+    return os.path.join(dest_path, markdown_name[:-3], "index.html")
+
+def run_page_tasks(tasks, jobs, keep_content=False, profile=False, executor=None):
+    render = partial(render_task, keep_content=keep_content, profile=profile)
+    if executor is not None:
+        yield from bounded_map(executor, render, tasks, jobs * 2)
+        return
+    if jobs <= 1:
+        for task in tasks:
+            try:
+                yield task, render_task(task, keep_content, profile), None
+            except Exception as error:
+                yield task, None, error
+        return
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        yield from bounded_map(executor, render, tasks, jobs * 2)
+
+def render_task(task, keep_content=False, profile=False):
+    (_, output_path, _, _, _, _), markdown, template = task
+    return render_page(markdown, template, output_path, keep_content, profile)
+
+def render_page(markdown, template, output_path, keep_content=False, profile=False):
+    if profile:
+        return render_page_profiled(markdown, template, output_path)
+    metadata, body = split_front_matter(markdown)
+    variables = page_variables(body, metadata, template.url_rewriter)
+    if keep_content:
+        variables["Content"] = variables["Content"].to_html()
+    return variables["Title"], variables["Content"] if keep_content else None, template.render(variables), None
+
+def render_page_profiled(markdown, template, output_path):
+    profiler = BuildProfiler()
+    with profiler.stage("front matter", output_path):
+        metadata, body = split_front_matter(markdown)
+    with profiler.stage("block split", output_path):
+        blocks = list(iter_markdown_blocks(body))
+    with profiler.stage("block classify", output_path):
+        block_types = [block_to_block_type(block) for block in blocks]
+    with profiler.stage("inline parse", output_path):
+        block_nodes = []
+        for block, block_type in zip(blocks, block_types):
+            append_block_nodes(block_nodes, block, block_type, template.url_rewriter)
+        title = metadata.get("title") or extract_title(body)
+    with profiler.stage("serialize", output_path):
+        content_html = ParentNode("div", block_nodes).to_html()
+    with profiler.stage("template", output_path):
+        webpage = template.render({**metadata_variables(metadata), "Title": title, "Content": content_html})
+    return title, content_html, webpage, profiler.events
+
+def page_variables(markdown, metadata=None, url_rewriter=IDENTITY_REWRITER):
+    metadata = metadata or {}
+    return {
+        **metadata_variables(metadata),
+        "Title": metadata.get("title") or extract_title(markdown),
+        "Content": markdown_to_html_node(markdown, url_rewriter),
+    }
+
+def metadata_variables(metadata):
+    variables = {}
+    for key, value in metadata.items():
+        variables[key] = ", ".join(str(item) for item in value) if isinstance(value, list) else value
+    return variables
+
+def read_markdown_file(markdown_path):
+    markdown_file = open(markdown_path, encoding="utf-8")
+    markdown_content = markdown_file.read()
+    markdown_file.close()
+    return markdown_content
+
+def print_metadata(pages, io_workers=DEFAULT_IO_WORKERS):
+    for markdown_path, _, metadata, error in scan_metadata(pages, io_workers):
+        if error is not None:
+            logger.error(f"{markdown_path}: {error}")
+            continue
+        print(json.dumps({"source": markdown_path, **metadata}, default=str))
+
+def parse_arguments(program_arguments):
+    parser = argparse.ArgumentParser(description="Generate a static site from markdown content")
+    parser.add_argument("basepath", nargs="?", default="/")
+    parser.add_argument("--content", default=os.path.join(PROJECT_ROOT, "content"),
+                        help="directory of markdown pages")
+    parser.add_argument("--static", default=os.path.join(PROJECT_ROOT, "static"),
+                        help="directory of static files copied into the output")
+    parser.add_argument("--templates", default=PROJECT_ROOT,
+                        help="directory of the .html page templates")
+    parser.add_argument("--output", default=os.path.join(PROJECT_ROOT, "docs"),
+                        help="directory the site is generated into")
+    parser.add_argument("--site-url",
+                        help="absolute URL of the site, e.g. https://example.com; enables sitemap.xml, feed.xml and search-index.json")
+    parser.add_argument("--site-title", default="",
+                        help="title used for the RSS feed")
+    parser.add_argument("--search", action="store_true",
+                        help="write a sharded inverted search index to search/ for client-side search")
+    parser.add_argument("--incremental", action="store_true",
+                        help="only rebuild pages and static files whose inputs changed since the last build")
+    parser.add_argument("--jobs", "-j", type=int, default=1,
+                        help="number of worker processes used to render pages (0 uses every CPU)")
+    parser.add_argument("--io-workers", type=int, default=DEFAULT_IO_WORKERS,
+                        help="number of threads that prefetch markdown files and write finished pages")
+    parser.add_argument("--checksum", action="store_true",
+                        help="compare static files by content hash when their size matches but mtime differs")
+    parser.add_argument("--fingerprint", action="store_true",
+                        help="copy static files under content-hashed names like index.3f9a1c2b.css, write assets.json "
+                             "and rewrite href and src references to them")
+    parser.add_argument("--link-static", action="store_true",
+                        help="hardlink static files into the output instead of copying them when possible")
+    parser.add_argument("--cache-dir", default=DEFAULT_CACHE_PATH,
+                        help="directory of the persistent render cache")
+    parser.add_argument("--cache-size", type=int, default=DEFAULT_MAX_BYTES // (1024 * 1024),
+                        help="maximum size of the render cache in megabytes")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="render every changed page without consulting the render cache")
+    parser.add_argument("--staging", action="store_true",
+                        help="build into a staging copy of the output directory and swap it in when the build succeeds; "
+                             "the swap is atomic on Linux, elsewhere the output is missing between two renames")
+    parser.add_argument("--drafts", action="store_true",
+                        help="also render pages whose front matter sets draft: true")
+    parser.add_argument("--metadata-only", action="store_true",
+                        help="print the front matter and title of every page as JSON lines without rendering anything")
+    parser.add_argument("--explain", action="store_true",
+                        help="print why each page was rebuilt")
+    parser.add_argument("--watch", action="store_true",
+                        help="keep running and rebuild only the pages and static files that change")
+    parser.add_argument("--serve", metavar="SOCKET",
+                        help="after the first build, keep running and rebuild whenever a request arrives on this unix socket")
+    parser.add_argument("--request", metavar="SOCKET",
+                        help="ask the build server listening on this unix socket to rebuild, then print its reply")
+    parser.add_argument("--request-command", choices=BUILD_COMMANDS, default="build",
+                        help="what to ask the build server to do")
+    parser.add_argument("--profile", action="store_true",
+                        help="time every build stage and page and print the slowest ones")
+    parser.add_argument("--trace", metavar="FILE",
+                        help="write the profile as a Chrome trace JSON file (implies --profile)")
+    parser.add_argument("--log-level", choices=LOG_LEVELS, default="info",
+                        help="how much build progress to print")
+    return parser.parse_args(program_arguments)
+
+class SiteConfig:
+    def __init__(self, content_path, static_path, template_path, output_path, base_path="/", jobs=1,
+                 io_workers=DEFAULT_IO_WORKERS, incremental=False, checksum=False, link_static=False, staging=False,
+                 drafts=False, cache_path=DEFAULT_CACHE_PATH, cache_size=DEFAULT_MAX_BYTES, use_cache=True, site_url=None,
+                 site_title="", search=False, fingerprint=False):
+        self.content_path = content_path
+        self.static_path = static_path
+        self.template_path = template_path
+        self.output_path = output_path
+        self.base_path = base_path
+        self.jobs = jobs if jobs > 0 else os.cpu_count() or 1
+        self.io_workers = io_workers
+        self.incremental = incremental
+        self.checksum = checksum
+        self.link_static = link_static
+        self.staging = staging
+        self.drafts = drafts
+        self.cache_path = cache_path
+        self.cache_size = cache_size
+        self.use_cache = use_cache
+        self.site_url = site_url
+        self.site_title = site_title
+        self.search = search
+        self.fingerprint = fingerprint
+
+class SiteBuilder:
+    def __init__(self, config):
+        self.config = config
+        self.base_rewriter = BasePathRewriter(config.base_path)
+        self.url_rewriter = self.base_rewriter
+        self.render_cache = RenderCache(config.cache_path, config.cache_size) if config.use_cache else None
+        self.templates = None
+        self.manifest = None
+        self.executor = ProcessPoolExecutor(max_workers=config.jobs) if config.jobs > 1 else None
+
+    def build(self, profiler=DISABLED_PROFILER):
+        config = self.config
+        start_time = time.perf_counter()
+        build_path = config.output_path
+        if config.staging:
+            build_path = staging_path(config.output_path)
+            logger.info(f"staging the build in {build_path}")
+            prepare_staging(config.output_path, build_path)
+        if self.manifest is None:
+            self.manifest = load_manifest(build_path, rebuild=not config.incremental)
         else:
-            print(f"\nlooking for markdown in {new_from_path}")
-            generate_multiple_pages(new_from_path, template_path, new_dest_path, base_path)
-    return
-
-def generate_page(from_path, template_path, dest_path, base_path):
-    print(f"Generating page from {from_path} to {dest_path} using {template_path}")
-
-    markdown = read_markdown(from_path)
-    markdown_html_node = markdown_to_html_node(markdown)
-    title = extract_title(markdown)
-
-    template = read_template(template_path)
-    webpage = template.replace("{{ Title }}", title)
-    webpage = webpage.replace("{{ Content }}", markdown_html_node.to_html())
-    webpage = webpage.replace("href=\"/", f"href=\"{base_path}")
-    webpage = webpage.replace("src=\"/", f"src=\"{base_path}")
-
-    if not os.path.exists(dest_path):
-        os.makedirs(dest_path, exist_ok=True)
-    webpage_file = open(os.path.join(dest_path, "index.html"), "w")
-    webpage_file.write(webpage)
-    webpage_file.close()
-
-def read_markdown(from_path):
-    if not os.path.exists(from_path):
-        raise Exception("Invalid path")
-    for file in os.listdir(from_path):
-        if os.path.isfile(os.path.join(from_path, file)) and file[-3:] == ".md":
-            markdown_file = open(os.path.join(from_path, file))
-            markdown_content = markdown_file.read()
-            markdown_file.close()
-            return markdown_content
-
-def read_template(template_path):
-    if not os.path.exists(template_path):
-        raise Exception("Invalid path")
-    for file in os.listdir(template_path):
-        if os.path.isfile(os.path.join(template_path, file)) and file[-5:] == ".html":
-            template_file = open(os.path.join(template_path, file))
-            template_content = template_file.read()
-            template_file.close()
-            return template_content
+            self.manifest.begin_build()
+        manifest = self.manifest
+        manifest.dest_path = build_path
+        try:
+            with profiler.stage("static copy"):
+                if config.fingerprint:
+                    self.url_rewriter = fingerprint_static(config.static_path, build_path, manifest, self.base_rewriter,
+                                                           config.link_static, config.jobs)
+                else:
+                    sync_static(config.static_path, build_path, manifest, config.checksum, config.link_static, config.jobs)
+            with profiler.stage("discovery"):
+                pages = discover_pages(config.content_path, build_path)
+            with profiler.stage("template index"):
+                templates = self.template_index()
+            page_count = generate_pages(pages, templates, manifest, config.jobs, self.render_cache, profiler,
+                                        config.io_workers, config.drafts, self.executor)
+            self.write_indexes(profiler)
+            for output_path in manifest.remove_stale_outputs():
+                logger.info(f"removed stale output {output_path}")
+            if manifest.rebuild:
+                for output_path in manifest.remove_untracked_outputs():
+                    logger.info(f"removed untracked output {output_path}")
+            manifest.save()
+            if config.staging:
+                swap_staging(build_path, config.output_path)
+                manifest.dest_path = config.output_path
+                logger.info(f"swapped {build_path} into {config.output_path}")
+        except BaseException:
+            if config.staging:
+                self.manifest = None
+            raise
+        return {
+            "pages": page_count,
+            "rebuilt": dict(sorted(manifest.reasons.items())),
+            "seconds": time.perf_counter() - start_time,
+        }
+
+    def write_indexes(self, profiler=DISABLED_PROFILER):
+        config = self.config
+        if config.site_url is not None:
+            with profiler.stage("site indexes"):
+                write_site_indexes(self.manifest, self.url_rewriter, config.site_url, config.site_title)
+        if config.search:
+            with profiler.stage("search index"):
+                write_search_index(self.manifest, self.url_rewriter, self.executor,
+                                   config.cache_path if config.use_cache else None)
+
+    def template_index(self):
+        if (self.templates is None or self.templates.url_rewriter.key != self.url_rewriter.key
+                or not self.templates.is_current()):
+            self.templates = TemplateIndex(self.config.template_path, self.config.content_path, self.url_rewriter)
+        return self.templates
+
+    def watch(self):
+        config = self.config
+        watcher = PollingWatcher([config.content_path, config.static_path], {config.template_path: TEMPLATE_EXTENSION})
+        logger.info(f"watching {config.content_path}, {config.static_path} and the templates in {config.template_path} "
+                    f"for changes")
+        for changed, removed in watcher.changes(WATCH_INTERVAL):
+            start_time = time.perf_counter()
+            try:
+                self.rebuild_changes(changed, removed)
+            except Exception as error:
+                logger.error(f"rebuild failed: {error}")
+            self.manifest.save()
+            logger.info(f"rebuilt in {(time.perf_counter() - start_time) * 1000:.1f}ms")
+
+    def rebuild_changes(self, changed, removed):
+        config = self.config
+        manifest = self.manifest
+        manifest.rebuild = False
+        manifest.reasons = {}
+        dest_path = config.output_path
+        if config.fingerprint and any(is_within(path, config.static_path) for path in [*changed, *removed]):
+            self.url_rewriter = fingerprint_static(config.static_path, dest_path, manifest, self.base_rewriter,
+                                                   config.link_static, config.jobs)
+        pages = set()
+        templates_changed = any(path.endswith(TEMPLATE_EXTENSION)
+                                and os.path.dirname(os.path.abspath(path)) == os.path.abspath(config.template_path)
+                                for path in [*changed, *removed])
+        if templates_changed or self.templates is None or self.templates.url_rewriter.key != self.url_rewriter.key:
+            pages.update(discover_pages(config.content_path, dest_path))
+        templates = self.template_index()
+        for path in changed:
+            if is_within(path, config.content_path) and path[-3:] == ".md":
+                pages.add((path, content_output_path(path, config.content_path, dest_path)))
+            pages.update((source, output_path) for source, output_path in manifest.dependents(path)
+                         if is_within(source, config.content_path) and source[-3:] == ".md")
+        generate_pages(sorted(pages), templates, manifest, config.jobs, self.render_cache, io_workers=config.io_workers,
+                       drafts=config.drafts, executor=self.executor)
+        for path in changed:
+            if is_within(path, config.static_path) and not config.fingerprint:
+                sync_static_file(path, os.path.join(dest_path, os.path.relpath(path, config.static_path)), manifest,
+                                 config.checksum, config.link_static)
+        for path in removed:
+            if is_within(path, config.content_path) and path[-3:] == ".md":
+                manifest.remove_output(content_output_path(path, config.content_path, dest_path))
+            elif is_within(path, config.static_path) and not config.fingerprint:
+                manifest.remove_output(os.path.join(dest_path, os.path.relpath(path, config.static_path)))
+        self.write_indexes()
+        return dict(sorted(manifest.reasons.items()))
+
+    def close(self):
+        if self.manifest is not None:
+            self.manifest.save()
+        if self.render_cache is not None:
+            self.render_cache.close()
+        if self.executor is not None:
+            self.executor.shutdown()
+
+def site_config(arguments):
+    return SiteConfig(
+        content_path=arguments.content,
+        static_path=arguments.static,
+        template_path=arguments.templates,
+        output_path=arguments.output,
+        base_path=arguments.basepath,
+        jobs=arguments.jobs,
+        io_workers=arguments.io_workers,
+        incremental=arguments.incremental,
+        checksum=arguments.checksum,
+        link_static=arguments.link_static,
+        staging=arguments.staging,
+        drafts=arguments.drafts,
+        cache_path=arguments.cache_dir,
+        cache_size=arguments.cache_size * 1024 * 1024,
+        use_cache=not arguments.no_cache,
+        site_url=arguments.site_url,
+        site_title=arguments.site_title,
+        search=arguments.search,
+        fingerprint=arguments.fingerprint,
+    )
 
 def main():
-    program_arguments = sys.argv
-    basepath = "/"
-    if len(program_arguments) > 1:
-        basepath = program_arguments[1]
-    from_path = "/home/filip/workspace/github.com/FilipKDev/static_site_generator/content"
-    template_path = "/home/filip/workspace/github.com/FilipKDev/static_site_generator"
-    dest_path = "/home/filip/workspace/github.com/FilipKDev/static_site_generator/docs"
-    
-    if os.path.exists(dest_path):
-        print(f"removing {dest_path} and its contents")
-        shutil.rmtree(dest_path)
-    copy_files("/home/filip/workspace/github.com/FilipKDev/static_site_generator/static", dest_path)
-    generate_multiple_pages(from_path, template_path, dest_path, basepath)
-
-main()
\ No newline at end of file
+    arguments = parse_arguments(sys.argv[1:])
+    logging.basicConfig(level=arguments.log_level.upper(), format="%(message)s")
+    if arguments.request is not None:
+        response = request_build(arguments.request, arguments.request_command)
+        print(json.dumps(response, indent=1))
+        if not response.get("ok"):
+            sys.exit(1)
+        return
+    config = site_config(arguments)
+    if arguments.metadata_only:
+        print_metadata(discover_pages(config.content_path, config.output_path), config.io_workers)
+        return
+    profiler = BuildProfiler(enabled=arguments.profile or arguments.trace is not None)
+    builder = SiteBuilder(config)
+    try:
+        result = builder.build(profiler)
+        if arguments.explain:
+            for output_key, reason in result["rebuilt"].items():
+                print(f"{output_key}: {reason}")
+        if profiler.enabled:
+            print(profiler.report())
+        if arguments.trace is not None:
+            profiler.write_trace(arguments.trace)
+        if arguments.serve is not None:
+            serve_builds(arguments.serve, builder)
+        elif arguments.watch:
+            try:
+                builder.watch()
+            except KeyboardInterrupt:
+                logger.info("stopped watching")
+    finally:
+        builder.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,182 @@
+from output import write_output
+import hashlib
+import json
+import os
+
+MANIFEST_FILE = ".ssg-manifest.json"
+MANIFEST_VERSION = 1
+HASH_CHUNK_SIZE = 1024 * 1024
+
+def hash_bytes(*parts):
+    digest = hashlib.sha256()
+    for part in parts:
+        if isinstance(part, str):
+            part = part.encode("utf-8")
+        digest.update(part)
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+def hash_file(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as file:
+        chunk = file.read(HASH_CHUNK_SIZE)
+        while chunk:
+            digest.update(chunk)
+            chunk = file.read(HASH_CHUNK_SIZE)
+    return digest.hexdigest()
+
+def file_signature(path):
+    stat_result = os.stat(path)
+    return f"{stat_result.st_size}:{stat_result.st_mtime_ns}"
+
+def signature_mtime(signature):
+    return int(signature.rsplit(":", 1)[1]) / 1e9
+
+class BuildManifest:
+    def __init__(self, dest_path, entries=None, rebuild=False):
+        self.dest_path = dest_path
+        self.entries = entries if entries is not None else {}
+        self.rebuild = rebuild
+        self.seen = set()
+        self.reasons = {}
+        self.dependents_index = None
+
+    def relative(self, output_path):
+        return os.path.relpath(output_path, self.dest_path)
+
+    def begin_build(self, rebuild=False):
+        self.rebuild = rebuild
+        self.seen = set()
+        self.reasons = {}
+
+    def stale_reason(self, output_path, dependencies, options=None):
+        key = self.relative(output_path)
+        self.seen.add(key)
+        entry = self.entries.get(key)
+        if self.rebuild:
+            return "full rebuild requested"
+        if entry is None:
+            return "new output"
+        if not os.path.exists(output_path):
+            return "output is missing"
+        if entry.get("options") != options:
+            return "build options changed"
+        recorded = entry.get("dependencies")
+        if recorded is None:
+            return "no recorded dependencies"
+        for path, signature in dependencies.items():
+            if path not in recorded:
+                return f"new dependency {path}"
+            if recorded[path] != signature:
+                return f"{path} changed"
+        for path in recorded:
+            if path not in dependencies:
+                return f"no longer depends on {path}"
+        return None
+
+    def is_current(self, output_path, digest):
+        key = self.relative(output_path)
+        self.seen.add(key)
+        entry = self.entries.get(key)
+        if self.rebuild or entry is None or entry["hash"] != digest:
+            return False
+        return os.path.exists(output_path)
+
+    def record(self, source_path, output_path, digest, dependencies=None, options=None, reason=None, metadata=None):
+        key = self.relative(output_path)
+        self.seen.add(key)
+        entry = {"source": source_path, "hash": digest}
+        if dependencies is not None:
+            entry["dependencies"] = dependencies
+        if options is not None:
+            entry["options"] = options
+        if metadata:
+            entry["metadata"] = metadata
+        self.unindex(key)
+        self.entries[key] = entry
+        self.index(key)
+        if reason is not None:
+            self.reasons[key] = reason
+
+    def metadata(self, output_path):
+        return self.entries.get(self.relative(output_path), {}).get("metadata", {})
+
+    def dependents(self, path):
+        if self.dependents_index is None:
+            self.dependents_index = {}
+            for key in self.entries:
+                self.index(key)
+        return [(self.entries[key]["source"], os.path.join(self.dest_path, key))
+                for key in sorted(self.dependents_index.get(path, ()))]
+
+    def index(self, key):
+        if self.dependents_index is None:
+            return
+        entry = self.entries[key]
+        for path in [entry["source"], *entry.get("dependencies", ())]:
+            self.dependents_index.setdefault(path, set()).add(key)
+
+    def unindex(self, key):
+        if self.dependents_index is None or key not in self.entries:
+            return
+        entry = self.entries[key]
+        for path in [entry["source"], *entry.get("dependencies", ())]:
+            self.dependents_index.get(path, set()).discard(key)
+
+    def remove_output(self, output_path):
+        key = self.relative(output_path)
+        self.seen.discard(key)
+        self.unindex(key)
+        self.entries.pop(key, None)
+        if os.path.isfile(output_path):
+            os.remove(output_path)
+            remove_empty_parents(os.path.dirname(output_path), self.dest_path)
+
+    def remove_stale_outputs(self):
+        removed = []
+        for key in sorted(set(self.entries) - self.seen):
+            output_path = os.path.join(self.dest_path, key)
+            if os.path.isfile(output_path):
+                os.remove(output_path)
+                remove_empty_parents(os.path.dirname(output_path), self.dest_path)
+            self.unindex(key)
+            del self.entries[key]
+            removed.append(output_path)
+        return removed
+
+    def remove_untracked_outputs(self):
+        removed = []
+        for directory, _, files in os.walk(self.dest_path):
+            for file in files:
+                output_path = os.path.join(directory, file)
+                key = self.relative(output_path)
+                if key != MANIFEST_FILE and key not in self.entries:
+                    os.remove(output_path)
+                    removed.append(output_path)
+        for output_path in removed:
+            remove_empty_parents(os.path.dirname(output_path), self.dest_path)
+        return removed
+
+    def save(self):
+        manifest_path = os.path.join(self.dest_path, MANIFEST_FILE)
+        write_output(manifest_path, json.dumps({"version": MANIFEST_VERSION, "outputs": self.entries}, indent=1, sort_keys=True))
+
+def load_manifest(dest_path, rebuild=False):
+    manifest_path = os.path.join(dest_path, MANIFEST_FILE)
+    if not os.path.isfile(manifest_path):
+        return BuildManifest(dest_path, rebuild=rebuild)
+    try:
+        with open(manifest_path, encoding="utf-8") as manifest_file:
+            data = json.load(manifest_file)
+    except (OSError, ValueError):
+        return BuildManifest(dest_path, rebuild=rebuild)
+    if data.get("version") != MANIFEST_VERSION:
+        return BuildManifest(dest_path, rebuild=rebuild)
+    return BuildManifest(dest_path, data.get("outputs", {}), rebuild)
+
+def remove_empty_parents(directory, stop_path):
+    stop_path = os.path.abspath(stop_path)
+    directory = os.path.abspath(directory)
+    while directory != stop_path and directory.startswith(stop_path) and not os.listdir(directory):
+        os.rmdir(directory)
+        directory = os.path.dirname(directory)
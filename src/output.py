@@ -0,0 +1,102 @@
+from contextlib import contextmanager
+import ctypes
+import filecmp
+import logging
+import os
+import shutil
+import sys
+
+STAGING_SUFFIX = ".staging"
+REPLACED_SUFFIX = ".old"
+OUTPUT_ENCODING = "utf-8"
+AT_FDCWD = -100
+RENAME_EXCHANGE = 2
+
+logger = logging.getLogger(__name__)
+
+def write_output(output_path, content):
+    data = content.encode(OUTPUT_ENCODING) if isinstance(content, str) else content
+    if has_contents(output_path, data):
+        logger.debug(f"{output_path} is unchanged")
+        return False
+    os.makedirs(os.path.dirname(output_path), exist_ok=True)
+    temporary_path = f"{output_path}.{os.getpid()}.tmp"
+    try:
+        file_descriptor = os.open(temporary_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o666)
+        with open(file_descriptor, "wb") as temporary_file:
+            temporary_file.write(data)
+        os.replace(temporary_path, output_path)
+    except BaseException:
+        if os.path.exists(temporary_path):
+            os.remove(temporary_path)
+        raise
+    return True
+
+@contextmanager
+def open_output(output_path):
+    os.makedirs(os.path.dirname(output_path), exist_ok=True)
+    temporary_path = f"{output_path}.{os.getpid()}.tmp"
+    try:
+        with open(temporary_path, "w", encoding=OUTPUT_ENCODING) as temporary_file:
+            yield temporary_file
+        if os.path.isfile(output_path) and filecmp.cmp(temporary_path, output_path, shallow=False):
+            logger.debug(f"{output_path} is unchanged")
+            os.remove(temporary_path)
+        else:
+            os.replace(temporary_path, output_path)
+    except BaseException:
+        if os.path.exists(temporary_path):
+            os.remove(temporary_path)
+        raise
+
+def has_contents(path, data):
+    try:
+        if os.stat(path).st_size != len(data):
+            return False
+        with open(path, "rb") as existing_file:
+            return existing_file.read() == data
+    except OSError:
+        return False
+
+def staging_path(dest_path):
+    return os.path.normpath(dest_path) + STAGING_SUFFIX
+
+def prepare_staging(dest_path, stage_path):
+    if os.path.exists(stage_path):
+        shutil.rmtree(stage_path)
+    if not os.path.isdir(dest_path):
+        os.makedirs(stage_path)
+        return
+    shutil.copytree(dest_path, stage_path, copy_function=link_or_copy)
+
+def link_or_copy(source_path, destination_path):
+    try:
+        os.link(source_path, destination_path)
+    except OSError:
+        shutil.copy2(source_path, destination_path)
+
+def swap_staging(stage_path, dest_path):
+    replaced_path = os.path.normpath(dest_path) + REPLACED_SUFFIX
+    if os.path.exists(replaced_path):
+        shutil.rmtree(replaced_path)
+    if os.path.isdir(dest_path) and exchange_paths(stage_path, dest_path):
+        shutil.rmtree(stage_path)
+        return
+    if os.path.exists(dest_path):
+        os.rename(dest_path, replaced_path)
+    os.rename(stage_path, dest_path)
+    if os.path.exists(replaced_path):
+        shutil.rmtree(replaced_path)
+
+def exchange_paths(first_path, second_path):
+    if not sys.platform.startswith("linux"):
+        return False
+    try:
+        renameat2 = ctypes.CDLL(None, use_errno=True).renameat2
+    except (OSError, AttributeError):
+        return False
+    result = renameat2(AT_FDCWD, os.fsencode(first_path), AT_FDCWD, os.fsencode(second_path), RENAME_EXCHANGE)
+    if result != 0:
+        logger.debug(f"could not exchange {first_path} and {second_path}: {os.strerror(ctypes.get_errno())}")
+        return False
+    return True
@@ -1,15 +1,17 @@
 from htmlnode import HTMLNode
 
 class ParentNode(HTMLNode):
+    __slots__ = ()
+
     def __init__(self, tag, children, props=None):
         super().__init__(tag, None, children, props)
 
-    def to_html(self):
+    def write_html(self, fp):
         if self.tag == None:
             raise ValueError("parent node must have a tag")
         if not self.children:
             raise ValueError("parent node must have children")
-        html_string = ""
+        fp.write(f"<{self.tag}{self.props_to_html()}>")
         for child in self.children:
-            html_string += child.to_html()
-        return f"<{self.tag}{self.props_to_html()}>{html_string}</{self.tag}>"
+            child.write_html(fp)
+        fp.write(f"</{self.tag}>")
@@ -0,0 +1,61 @@
+from collections import deque
+from output import write_output
+from profiler import DISABLED_PROFILER
+import queue
+import threading
+
+DEFAULT_IO_WORKERS = 8
+DEFAULT_QUEUE_DEPTH = 64
+
+def bounded_map(executor, function, items, depth):
+    pending = deque()
+    for item in items:
+        pending.append((item, executor.submit(function, item)))
+        if len(pending) >= depth:
+            yield result_of(*pending.popleft())
+    while pending:
+        yield result_of(*pending.popleft())
+
+def result_of(item, future):
+    try:
+        return item, future.result(), None
+    except Exception as error:
+        return item, None, error
+
+class WriteQueue:
+    def __init__(self, workers=DEFAULT_IO_WORKERS, depth=DEFAULT_QUEUE_DEPTH, profiler=DISABLED_PROFILER):
+        self.profiler = profiler
+        self.queue = queue.Queue(depth)
+        self.results = queue.SimpleQueue()
+        self.threads = [threading.Thread(target=self.drain, daemon=True) for _ in range(max(1, workers))]
+        for thread in self.threads:
+            thread.start()
+
+    def put(self, tag, output_path, content):
+        self.queue.put((tag, output_path, content))
+
+    def drain(self):
+        while True:
+            item = self.queue.get()
+            if item is None:
+                return
+            tag, output_path, content = item
+            try:
+                with self.profiler.stage("write", output_path):
+                    write_output(output_path, content)
+                self.results.put((tag, None))
+            except Exception as error:
+                self.results.put((tag, error))
+
+    def finished(self):
+        results = []
+        while not self.results.empty():
+            results.append(self.results.get())
+        return results
+
+    def close(self):
+        for _ in self.threads:
+            self.queue.put(None)
+        for thread in self.threads:
+            thread.join()
+        return self.finished()
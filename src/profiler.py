@@ -0,0 +1,73 @@
+from contextlib import contextmanager, nullcontext
+import json
+import os
+import time
+
+class BuildProfiler:
+    def __init__(self, enabled=True):
+        self.enabled = enabled
+        self.events = []
+
+    def stage(self, name, page=None):
+        if not self.enabled:
+            return nullcontext()
+        return self.record(name, page)
+
+    @contextmanager
+    def record(self, name, page):
+        start = time.perf_counter_ns()
+        cpu_start = time.process_time_ns()
+        try:
+            yield
+        finally:
+            wall = time.perf_counter_ns() - start
+            cpu = time.process_time_ns() - cpu_start
+            self.events.append((name, page, start, wall, cpu, os.getpid()))
+
+    def merge(self, events):
+        if self.enabled and events:
+            self.events.extend(events)
+
+    def stage_totals(self):
+        totals = {}
+        for name, _, _, wall, cpu, _ in self.events:
+            count, wall_total, cpu_total = totals.get(name, (0, 0, 0))
+            totals[name] = (count + 1, wall_total + wall, cpu_total + cpu)
+        return sorted(totals.items(), key=lambda item: item[1][1], reverse=True)
+
+    def page_totals(self):
+        totals = {}
+        for _, page, _, wall, cpu, _ in self.events:
+            if page is None:
+                continue
+            wall_total, cpu_total = totals.get(page, (0, 0))
+            totals[page] = (wall_total + wall, cpu_total + cpu)
+        return sorted(totals.items(), key=lambda item: item[1][0], reverse=True)
+
+    def report(self, limit=10):
+        lines = [f"{'stage':<16} {'count':>7} {'wall ms':>10} {'cpu ms':>10} {'wall %':>7}"]
+        stage_totals = self.stage_totals()
+        total_wall = sum(wall for _, (_, wall, _) in stage_totals) or 1
+        for name, (count, wall, cpu) in stage_totals:
+            lines.append(f"{name:<16} {count:>7} {wall / 1e6:>10.2f} {cpu / 1e6:>10.2f} {100 * wall / total_wall:>6.1f}%")
+        page_totals = self.page_totals()
+        if page_totals:
+            lines.append("")
+            lines.append(f"slowest {min(limit, len(page_totals))} of {len(page_totals)} pages")
+            lines.append(f"{'wall ms':>10} {'cpu ms':>10}  page")
+            for page, (wall, cpu) in page_totals[:limit]:
+                lines.append(f"{wall / 1e6:>10.2f} {cpu / 1e6:>10.2f}  {page}")
+        return "\n".join(lines)
+
+    def write_trace(self, trace_path):
+        trace_events = []
+        for name, page, start, wall, cpu, pid in sorted(self.events, key=lambda event: event[2]):
+            trace_event = {"name": name, "cat": "build", "ph": "X", "ts": start / 1000, "dur": wall / 1000,
+                           "pid": pid, "tid": pid, "args": {"cpu_ms": cpu / 1e6}}
+            if page is not None:
+                trace_event["args"]["page"] = page
+            trace_events.append(trace_event)
+        with open(trace_path, "w", encoding="utf-8") as trace_file:
+            json.dump({"traceEvents": trace_events, "displayTimeUnit": "ms"}, trace_file)
+
+DISABLED_PROFILER = BuildProfiler(enabled=False)
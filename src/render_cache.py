@@ -0,0 +1,67 @@
+from manifest import hash_bytes
+import os
+import sqlite3
+import time
+
+PARSER_VERSION = "3"
+CACHE_DIRECTORY = ".ssg-cache"
+CACHE_FILE = "renders.sqlite3"
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+class RenderCache:
+    def __init__(self, cache_path=CACHE_DIRECTORY, max_bytes=DEFAULT_MAX_BYTES):
+        os.makedirs(cache_path, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.connection = sqlite3.connect(os.path.join(cache_path, CACHE_FILE))
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS renders ("
+            "key TEXT PRIMARY KEY, title TEXT NOT NULL, html TEXT NOT NULL, "
+            "size INTEGER NOT NULL, last_used INTEGER NOT NULL)")
+        self.used_keys = {}
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, markdown, rewrite_key):
+        return hash_bytes(PARSER_VERSION, rewrite_key, markdown)
+
+    def get(self, markdown, rewrite_key):
+        key = self.key(markdown, rewrite_key)
+        row = self.connection.execute("SELECT title, html FROM renders WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.used_keys[key] = time.time_ns()
+        return row
+
+    def put(self, markdown, rewrite_key, title, html):
+        size = len(title.encode("utf-8")) + len(html.encode("utf-8"))
+        self.connection.execute(
+            "INSERT OR REPLACE INTO renders (key, title, html, size, last_used) VALUES (?, ?, ?, ?, ?)",
+            (self.key(markdown, rewrite_key), title, html, size, time.time_ns()))
+
+    def evict(self):
+        total_size = self.connection.execute("SELECT COALESCE(SUM(size), 0) FROM renders").fetchone()[0]
+        if total_size <= self.max_bytes:
+            return 0
+        evicted = 0
+        rows = self.connection.execute("SELECT key, size FROM renders ORDER BY last_used").fetchall()
+        for key, size in rows:
+            if total_size <= self.max_bytes:
+                break
+            self.connection.execute("DELETE FROM renders WHERE key = ?", (key,))
+            total_size -= size
+            evicted += 1
+        return evicted
+
+    def commit(self):
+        self.connection.executemany(
+            "UPDATE renders SET last_used = ? WHERE key = ?",
+            [(last_used, key) for key, last_used in self.used_keys.items()])
+        self.used_keys = {}
+        self.evict()
+        self.connection.commit()
+
+    def close(self):
+        self.commit()
+        self.connection.close()
@@ -0,0 +1,199 @@
+from block_markdown import iter_text_nodes
+from front_matter import split_front_matter
+from manifest import hash_bytes, file_signature
+from output import open_output, write_output
+from pipeline import bounded_map, DEFAULT_QUEUE_DEPTH
+from site_index import site_pages, page_url
+from collections import Counter
+from contextlib import ExitStack
+from itertools import groupby
+from operator import itemgetter
+import heapq
+import json
+import os
+import re
+import sqlite3
+import tempfile
+
+SEARCH_DIRECTORY = "search"
+SHARD_DIRECTORY = "terms"
+SEARCH_MANIFEST_FILE = "shards.json"
+DOCUMENTS_FILE = "documents.json"
+SEARCH_INDEX_SOURCE = "search index"
+SEARCH_INDEX_VERSION = "2"
+SEARCH_CACHE_DIRECTORY = "search"
+TERMS_FILE = "terms.sqlite3"
+RUN_SUFFIX = ".run"
+SHARD_PREFIX_LENGTH = 2
+CHUNK_PAGES = 1000
+MIN_TERM_LENGTH = 2
+MAX_TERM_LENGTH = 32
+TERM_PATTERN = re.compile(r"[^\W_]+")
+
+class TermCache:
+    def __init__(self, cache_path):
+        os.makedirs(cache_path, exist_ok=True)
+        self.connection = sqlite3.connect(os.path.join(cache_path, TERMS_FILE))
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS terms (key TEXT PRIMARY KEY, signature TEXT NOT NULL, terms TEXT NOT NULL)")
+
+    def get(self, key, signature):
+        row = self.connection.execute("SELECT signature, terms FROM terms WHERE key = ?", (key,)).fetchone()
+        if row is None or row[0] != signature:
+            return None
+        return row[1]
+
+    def put(self, key, signature, terms):
+        self.connection.execute("INSERT OR REPLACE INTO terms (key, signature, terms) VALUES (?, ?, ?)",
+                                (key, signature, terms))
+
+    def prune(self, keys):
+        stored_keys = [row[0] for row in self.connection.execute("SELECT key FROM terms")]
+        self.connection.executemany("DELETE FROM terms WHERE key = ?", [(key,) for key in stored_keys if key not in keys])
+
+    def close(self):
+        self.connection.commit()
+        self.connection.close()
+
+def write_search_index(manifest, url_rewriter, executor=None, cache_path=None, chunk_pages=CHUNK_PAGES):
+    search_path = os.path.join(manifest.dest_path, SEARCH_DIRECTORY)
+    search_manifest_path = os.path.join(search_path, SEARCH_MANIFEST_FILE)
+    pages = []
+    for key, metadata in site_pages(manifest):
+        entry = manifest.entries[key]
+        signature = entry.get("dependencies", {}).get(entry["source"], entry["hash"])
+        pages.append((key, metadata, entry["source"], signature))
+    digest = hash_bytes(SEARCH_INDEX_VERSION, url_rewriter.key,
+                        *(f"{key}:{signature}" for key, _, _, signature in pages))
+    if manifest.is_current(search_manifest_path, digest):
+        for key, entry in manifest.entries.items():
+            if entry["source"] == SEARCH_INDEX_SOURCE:
+                manifest.seen.add(key)
+        return False
+
+    bucket_count = 1
+    while bucket_count * chunk_pages < len(pages):
+        bucket_count *= 2
+    buckets = [[] for _ in range(bucket_count)]
+    for page in pages:
+        buckets[int(hash_bytes(page[0])[:8], 16) % bucket_count].append(page)
+
+    with ExitStack() as stack:
+        if cache_path is None:
+            cache_path = stack.enter_context(tempfile.TemporaryDirectory(prefix="ssg-search-"))
+        run_directory = os.path.join(cache_path, SEARCH_CACHE_DIRECTORY)
+        term_cache = TermCache(run_directory)
+        stack.callback(term_cache.close)
+        runs = []
+        stale_buckets = []
+        offset = 0
+        for bucket in buckets:
+            bucket_digest = hash_bytes(SEARCH_INDEX_VERSION, str(offset),
+                                       *(f"{key}:{signature}" for key, _, _, signature in bucket))
+            run_path = os.path.join(run_directory, f"{bucket_digest}{RUN_SUFFIX}")
+            if not os.path.exists(run_path):
+                stale_buckets.append((run_path, bucket, offset))
+            runs.append(run_path)
+            offset += len(bucket)
+
+        unindexed = [(key, source, signature) for _, bucket, _ in stale_buckets for key, _, source, signature in bucket
+                     if term_cache.get(key, signature) is None]
+        for (key, _, signature), terms, error in map_pages(executor, read_page_terms, unindexed):
+            if error is not None:
+                raise Exception(f"{key}: {error}")
+            term_cache.put(key, signature, terms)
+        for run_path, bucket, offset in stale_buckets:
+            write_run(run_path, bucket, offset, term_cache)
+
+        documents_path = os.path.join(search_path, DOCUMENTS_FILE)
+        with open_output(documents_path) as documents_file:
+            documents_file.write("[")
+            for document, (key, metadata, _, _) in enumerate(page for bucket in buckets for page in bucket):
+                separator = ",\n" if document else ""
+                entry = [page_url(key, url_rewriter), metadata.get("title", "")]
+                documents_file.write(separator + json.dumps(entry, separators=(",", ":"), ensure_ascii=False))
+            documents_file.write("]\n")
+        manifest.record(SEARCH_INDEX_SOURCE, documents_path, file_signature(documents_path))
+
+        shard_names = merge_runs(runs, manifest)
+        run_paths = set(runs)
+        for name in os.listdir(run_directory):
+            run_path = os.path.join(run_directory, name)
+            if name.endswith(RUN_SUFFIX) and run_path not in run_paths:
+                os.remove(run_path)
+        term_cache.prune({key for key, _, _, _ in pages})
+
+    search_manifest = {
+        "version": SEARCH_INDEX_VERSION,
+        "prefix_length": SHARD_PREFIX_LENGTH,
+        "documents": DOCUMENTS_FILE,
+        "shards": shard_names,
+    }
+    write_output(search_manifest_path, json.dumps(search_manifest, separators=(",", ":")) + "\n")
+    manifest.record(SEARCH_INDEX_SOURCE, search_manifest_path, digest)
+    return True
+
+def map_pages(executor, function, pages):
+    if executor is not None:
+        yield from bounded_map(executor, function, pages, DEFAULT_QUEUE_DEPTH)
+        return
+    for page in pages:
+        try:
+            yield page, function(page), None
+        except Exception as error:
+            yield page, None, error
+
+def read_page_terms(page):
+    with open(page[1], encoding="utf-8") as markdown_file:
+        terms = page_terms(markdown_file.read())
+    return " ".join(f"{term}:{count}" for term, count in sorted(terms.items()))
+
+def write_run(run_path, bucket, offset, term_cache):
+    postings = {}
+    for document, (key, _, _, signature) in enumerate(bucket, offset):
+        for item in term_cache.get(key, signature).split():
+            term, count = item.split(":")
+            postings.setdefault(term, []).append(f"[{document},{count}]")
+    temporary_path = f"{run_path}.{os.getpid()}.tmp"
+    with open(temporary_path, "w", encoding="utf-8") as run_file:
+        for term in sorted(postings):
+            run_file.write(f"{term}\t{','.join(postings[term])}\n")
+    os.replace(temporary_path, run_path)
+
+def run_postings(run_file):
+    for line in run_file:
+        yield line.rstrip("\n").split("\t", 1)
+
+def merge_runs(runs, manifest):
+    shard_names = []
+    with ExitStack() as stack:
+        postings = [run_postings(stack.enter_context(open(run_path, encoding="utf-8"))) for run_path in runs]
+        merged = heapq.merge(*postings, key=itemgetter(0))
+        for name, shard_postings in groupby(merged, key=lambda item: shard_name(item[0])):
+            shard_path = os.path.join(manifest.dest_path, SEARCH_DIRECTORY, SHARD_DIRECTORY, f"{name}.json")
+            with open_output(shard_path) as shard_file:
+                shard_file.write("{")
+                for term_index, (term, term_postings) in enumerate(groupby(shard_postings, key=itemgetter(0))):
+                    shard_file.write(f"{',' if term_index else ''}\n{json.dumps(term, ensure_ascii=False)}:[")
+                    shard_file.write(",".join(document_postings for _, document_postings in term_postings))
+                    shard_file.write("]")
+                shard_file.write("}\n")
+            manifest.record(SEARCH_INDEX_SOURCE, shard_path, file_signature(shard_path))
+            shard_names.append(name)
+    return shard_names
+
+def shard_name(term):
+    prefix = term[:SHARD_PREFIX_LENGTH]
+    if prefix.isascii() and prefix.isalnum():
+        return prefix
+    return prefix.encode("utf-8").hex()
+
+def page_terms(markdown):
+    _, body = split_front_matter(markdown)
+    terms = Counter()
+    for text_node in iter_text_nodes(body):
+        for match in TERM_PATTERN.finditer(text_node.text):
+            term = match.group().casefold()
+            if MIN_TERM_LENGTH <= len(term) <= MAX_TERM_LENGTH:
+                terms[term] += 1
+    return terms
@@ -0,0 +1,79 @@
+from datetime import datetime, timezone
+from email.utils import format_datetime
+from manifest import file_signature
+from output import open_output
+from xml.sax.saxutils import escape
+import heapq
+import json
+import os
+
+SITEMAP_FILE = "sitemap.xml"
+FEED_FILE = "feed.xml"
+SEARCH_INDEX_FILE = "search-index.json"
+SITE_INDEX_FILES = (SITEMAP_FILE, FEED_FILE, SEARCH_INDEX_FILE)
+SITE_INDEX_SOURCE = "site index"
+FEED_LIMIT = 20
+
+def write_site_indexes(manifest, url_rewriter, site_url, site_title="", feed_limit=FEED_LIMIT):
+    site_url = site_url.rstrip("/")
+    sitemap_path, feed_path, search_index_path = [os.path.join(manifest.dest_path, name) for name in SITE_INDEX_FILES]
+    feed_pages = []
+    page_count = 0
+    with open_output(sitemap_path) as sitemap, open_output(search_index_path) as search_index:
+        sitemap.write("<?xml version=\"1.0\" encoding=\"UTF-8\"?>\n")
+        sitemap.write("<urlset xmlns=\"http://www.sitemaps.org/schemas/sitemap/0.9\">\n")
+        search_index.write("[")
+        for key, metadata in site_pages(manifest):
+            url = page_url(key, url_rewriter)
+            published = page_date(metadata)
+            sitemap.write(f"<url><loc>{escape(site_url + url)}</loc><lastmod>{published.date().isoformat()}</lastmod></url>\n")
+            if page_count:
+                search_index.write(",\n")
+            search_index.write(json.dumps({
+                "url": url,
+                "title": metadata.get("title", ""),
+                "summary": metadata.get("summary", ""),
+                "tags": metadata.get("tags", []),
+            }, separators=(",", ":"), ensure_ascii=False))
+            entry = (published, key, metadata)
+            if len(feed_pages) < feed_limit:
+                heapq.heappush(feed_pages, entry)
+            elif entry > feed_pages[0]:
+                heapq.heapreplace(feed_pages, entry)
+            page_count += 1
+        sitemap.write("</urlset>\n")
+        search_index.write("]\n")
+
+    with open_output(feed_path) as feed:
+        feed.write("<?xml version=\"1.0\" encoding=\"UTF-8\"?>\n<rss version=\"2.0\"><channel>\n")
+        feed.write(f"<title>{escape(site_title)}</title><link>{escape(site_url + url_rewriter('/'))}</link>"
+                   f"<description>{escape(site_title)}</description>\n")
+        for published, key, metadata in sorted(feed_pages, reverse=True):
+            link = escape(site_url + page_url(key, url_rewriter))
+            feed.write(f"<item><title>{escape(str(metadata.get('title', '')))}</title><link>{link}</link>"
+                       f"<guid>{link}</guid><pubDate>{format_datetime(published)}</pubDate>"
+                       f"<description>{escape(metadata.get('summary', ''))}</description></item>\n")
+        feed.write("</channel></rss>\n")
+
+    for output_path in (sitemap_path, feed_path, search_index_path):
+        manifest.record(SITE_INDEX_SOURCE, output_path, file_signature(output_path))
+    return page_count
+
+def site_pages(manifest):
+    for key, entry in sorted(manifest.entries.items()):
+        if "metadata" in entry and key in manifest.seen:
+            yield key, entry["metadata"]
+
+def page_url(key, url_rewriter):
+    directory = os.path.dirname(key).replace(os.sep, "/")
+    return url_rewriter(f"/{directory}/" if directory else "/")
+
+def page_date(metadata):
+    date = metadata.get("date")
+    if date is not None:
+        try:
+            published = datetime.fromisoformat(str(date))
+            return published if published.tzinfo is not None else published.replace(tzinfo=timezone.utc)
+        except ValueError:
+            pass
+    return datetime.fromtimestamp(metadata.get("modified", 0), timezone.utc)
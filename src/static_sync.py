@@ -0,0 +1,123 @@
+from concurrent.futures import ThreadPoolExecutor
+from manifest import hash_file, file_signature
+import logging
+import os
+import shutil
+import threading
+
+logger = logging.getLogger(__name__)
+
+def sync_static(source_path, destination_path, manifest=None, checksum=False, link=False, workers=1):
+    files = [(source_file_path, os.path.join(destination_path, os.path.relpath(source_file_path, source_path)))
+             for source_file_path in list_files(source_path)]
+    sync_files(files, manifest, checksum, link, workers)
+
+def sync_files(files, manifest=None, checksum=False, link=False, workers=1):
+    copies = []
+    file_count = 0
+    for source_file_path, destination_file_path in files:
+        file_count += 1
+        if needs_copy(source_file_path, destination_file_path, checksum):
+            copies.append((source_file_path, destination_file_path))
+        elif manifest is not None:
+            manifest.record(source_file_path, destination_file_path, file_signature(source_file_path))
+
+    errors = []
+    for (source_file_path, destination_file_path), error in run_copies(copies, link, workers):
+        if error is not None:
+            errors.append(f"{source_file_path}: {error}")
+        elif manifest is not None:
+            manifest.record(source_file_path, destination_file_path, file_signature(source_file_path))
+    logger.info(f"Synced {len(copies) - len(errors)} of {file_count} static files")
+    if errors:
+        raise Exception(f"{len(errors)} of {len(copies)} static files failed to copy:\n" + "\n".join(errors))
+    return
+
+def sync_static_file(source_file_path, destination_file_path, manifest=None, checksum=False, link=False):
+    if needs_copy(source_file_path, destination_file_path, checksum):
+        copy_file(source_file_path, destination_file_path, link)
+    if manifest is not None:
+        manifest.record(source_file_path, destination_file_path, file_signature(source_file_path))
+
+def list_files(directory_path):
+    files = []
+    with os.scandir(directory_path) as entries:
+        for entry in sorted(entries, key=lambda entry: entry.name):
+            if entry.is_dir():
+                files.extend(list_files(entry.path))
+            elif entry.is_file():
+                files.append(entry.path)
+    return files
+
+def needs_copy(source_file_path, destination_file_path, checksum=False):
+    try:
+        destination_stat = os.stat(destination_file_path)
+    except FileNotFoundError:
+        return True
+    source_stat = os.stat(source_file_path)
+    if source_stat.st_size != destination_stat.st_size:
+        return True
+    if source_stat.st_mtime_ns == destination_stat.st_mtime_ns:
+        return False
+    if checksum and hash_file(source_file_path) == hash_file(destination_file_path):
+        if destination_stat.st_nlink > 1:
+            return True
+        shutil.copystat(source_file_path, destination_file_path)
+        return False
+    return True
+
+def run_copies(copies, link, workers):
+    if workers <= 1 or len(copies) <= 1:
+        for copy in copies:
+            try:
+                copy_file(copy[0], copy[1], link)
+                yield copy, None
+            except OSError as error:
+                yield copy, error
+        return
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(copy_file, copy[0], copy[1], link) for copy in copies]
+        for copy, future in zip(copies, futures):
+            try:
+                future.result()
+                yield copy, None
+            except OSError as error:
+                yield copy, error
+
+def copy_file(source_file_path, destination_file_path, link=False):
+    logger.debug(f"Copying {source_file_path} to {destination_file_path}")
+    os.makedirs(os.path.dirname(destination_file_path), exist_ok=True)
+    if link:
+        try:
+            if os.path.lexists(destination_file_path):
+                os.remove(destination_file_path)
+            os.link(source_file_path, destination_file_path)
+            return
+        except OSError:
+            pass
+    temporary_path = f"{destination_file_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        copied = False
+        if hasattr(os, "copy_file_range"):
+            try:
+                copy_file_range(source_file_path, temporary_path)
+                shutil.copystat(source_file_path, temporary_path)
+                copied = True
+            except OSError:
+                pass
+        if not copied:
+            shutil.copy2(source_file_path, temporary_path)
+        os.replace(temporary_path, destination_file_path)
+    except BaseException:
+        if os.path.exists(temporary_path):
+            os.remove(temporary_path)
+        raise
+
+def copy_file_range(source_file_path, destination_file_path):
+    with open(source_file_path, "rb") as source_file, open(destination_file_path, "wb") as destination_file:
+        remaining = os.fstat(source_file.fileno()).st_size
+        while remaining > 0:
+            copied = os.copy_file_range(source_file.fileno(), destination_file.fileno(), remaining)
+            if copied == 0:
+                break
+            remaining -= copied
@@ -0,0 +1,92 @@
+import io
+import os
+import re
+from htmlnode import HTMLNode
+from manifest import hash_bytes, file_signature
+from urls import IDENTITY_REWRITER
+
+TEMPLATE_SLOT_PATTERN = re.compile(r"\{\{ *(\w+) *\}\}")
+TEMPLATE_EXTENSION = ".html"
+DEFAULT_TEMPLATE = "template"
+
+class Template:
+    def __init__(self, source, url_rewriter=IDENTITY_REWRITER):
+        self.url_rewriter = url_rewriter
+        self.literals = []
+        self.slots = []
+        position = 0
+        for match in TEMPLATE_SLOT_PATTERN.finditer(source):
+            self.literals.append(url_rewriter.rewrite_html(source[position:match.start()]))
+            self.slots.append((match.group(1), match.group(0)))
+            position = match.end()
+        self.literals.append(url_rewriter.rewrite_html(source[position:]))
+
+    def render(self, variables):
+        buffer = io.StringIO()
+        self.write(buffer, variables)
+        return buffer.getvalue()
+
+    def write(self, fp, variables):
+        fp.write(self.literals[0])
+        for (name, slot_text), literal in zip(self.slots, self.literals[1:]):
+            value = variables.get(name, slot_text)
+            if isinstance(value, HTMLNode):
+                value.write_html(fp)
+            else:
+                fp.write(str(value))
+            fp.write(literal)
+
+class TemplateIndex:
+    def __init__(self, template_path, content_path, url_rewriter=IDENTITY_REWRITER):
+        self.template_path = template_path
+        self.content_path = content_path
+        self.url_rewriter = url_rewriter
+        self.templates = {}
+        self.files = {}
+        self.directories = {}
+        for name, path in template_files(template_path):
+            self.add(name, path)
+        if not self.templates:
+            raise Exception(f"no {TEMPLATE_EXTENSION} templates in {template_path}")
+        self.default = DEFAULT_TEMPLATE if DEFAULT_TEMPLATE in self.templates else next(iter(self.templates))
+
+    def add(self, name, path):
+        signature = file_signature(path)
+        with open(path, encoding="utf-8") as template_file:
+            source = template_file.read()
+        self.templates[name] = Template(source, self.url_rewriter)
+        self.files[name] = (path, signature, hash_bytes(source))
+
+    def resolve(self, markdown_path, name=None):
+        if name is not None:
+            if name not in self.templates:
+                raise Exception(f"unknown template {name}")
+            return name
+        directory = os.path.relpath(os.path.dirname(markdown_path), self.content_path)
+        resolved = self.directories.get(directory)
+        if resolved is None:
+            resolved = self.default
+            parts = [] if directory == os.curdir else directory.split(os.sep)
+            for length in range(len(parts), 0, -1):
+                candidate = ".".join(parts[:length])
+                if candidate in self.templates:
+                    resolved = candidate
+                    break
+            self.directories[directory] = resolved
+        return resolved
+
+    def is_current(self):
+        try:
+            current = {name: file_signature(path) for name, path in template_files(self.template_path)}
+        except OSError:
+            return False
+        return current == {name: signature for name, (_, signature, _) in self.files.items()}
+
+    def paths(self):
+        return [path for path, _, _ in self.files.values()]
+
+def template_files(template_path):
+    with os.scandir(template_path) as entries:
+        entries = sorted(entries, key=lambda entry: entry.name)
+    return [(entry.name[:-len(TEMPLATE_EXTENSION)], entry.path) for entry in entries
+            if entry.is_file() and entry.name.endswith(TEMPLATE_EXTENSION)]
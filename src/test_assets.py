@@ -0,0 +1,78 @@
+import hashlib
+import json
+import os
+import tempfile
+import unittest
+
+from assets import FingerprintRewriter, fingerprint_static, fingerprinted_name
+from manifest import BuildManifest
+from urls import BasePathRewriter
+
+class TestFingerprintRewriter(unittest.TestCase):
+    def test_fingerprinted_name(self):
+        self.assertEqual(fingerprinted_name("index.css", "3f9a1c2b77"), "index.3f9a1c2b.css")
+        self.assertEqual(fingerprinted_name("images/tom.png", "0123456789"), "images/tom.01234567.png")
+        self.assertEqual(fingerprinted_name("robots.txt", "0123456789"), "robots.txt")
+        self.assertEqual(fingerprinted_name("404.html", "0123456789"), "404.html")
+
+    def test_rewrites_assets_then_base_path(self):
+        rewriter = FingerprintRewriter({"index.css": "index.3f9a1c2b.css"}, BasePathRewriter("/site/"))
+        self.assertEqual(rewriter("/index.css"), "/site/index.3f9a1c2b.css")
+        self.assertEqual(rewriter("/index.css?v=1#top"), "/site/index.3f9a1c2b.css?v=1#top")
+        self.assertEqual(rewriter("/about"), "/site/about")
+        self.assertEqual(rewriter("index.css"), "index.css")
+        self.assertEqual(rewriter.rewrite_html("<link href=\"/index.css\">"), "<link href=\"/site/index.3f9a1c2b.css\">")
+
+    def test_key_changes_with_assets(self):
+        first = FingerprintRewriter({"index.css": "index.3f9a1c2b.css"})
+        second = FingerprintRewriter({"index.css": "index.77777777.css"})
+        self.assertNotEqual(first.key, second.key)
+        self.assertTrue(first.key.startswith("identity;"))
+
+class TestFingerprintStatic(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.static_path = os.path.join(self.directory.name, "static")
+        self.dest_path = os.path.join(self.directory.name, "docs")
+        self.manifest = BuildManifest(self.dest_path)
+        self.write(os.path.join(self.static_path, "index.css"), "body {}")
+        self.write(os.path.join(self.static_path, "images", "tom.png"), "png")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def write(self, path, text):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as file:
+            file.write(text)
+
+    def read_assets(self):
+        with open(os.path.join(self.dest_path, "assets.json")) as assets_file:
+            return json.load(assets_file)
+
+    def test_copies_assets_under_hashed_names(self):
+        rewriter = fingerprint_static(self.static_path, self.dest_path, self.manifest, workers=2)
+        css_name = f"index.{hashlib.sha256(b'body {}').hexdigest()[:8]}.css"
+        image_name = f"images/tom.{hashlib.sha256(b'png').hexdigest()[:8]}.png"
+        self.assertEqual(rewriter.assets, {"images/tom.png": image_name, "index.css": css_name})
+        self.assertEqual(sorted(os.listdir(self.dest_path)), ["assets.json", "images", css_name])
+        self.assertIn(css_name, self.manifest.entries)
+        self.assertEqual(self.manifest.entries["assets.json"]["source"], "asset manifest")
+
+    def test_hashes_are_reused_while_mtime_is_unchanged(self):
+        fingerprint_static(self.static_path, self.dest_path, self.manifest)
+        assets = self.read_assets()
+        assets["index.css"]["path"] = "index.cached.css"
+        with open(os.path.join(self.dest_path, "assets.json"), "w") as assets_file:
+            json.dump(assets, assets_file)
+        rewriter = fingerprint_static(self.static_path, self.dest_path, self.manifest)
+        self.assertEqual(rewriter("/index.css"), "/index.cached.css")
+
+        self.write(os.path.join(self.static_path, "index.css"), "main { margin: 0 }")
+        rewriter = fingerprint_static(self.static_path, self.dest_path, self.manifest)
+        self.assertEqual(rewriter("/index.css"), f"/index.{hashlib.sha256(b'main { margin: 0 }').hexdigest()[:8]}.css")
+        self.assertFalse(os.path.exists(os.path.join(self.dest_path, "index.cached.css")))
+        self.assertNotIn("index.cached.css", self.manifest.entries)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,9 +1,10 @@
 import unittest
-from block_markdown import markdown_to_blocks, block_to_block_type, markdown_to_html_node, extract_title
+import io
+from block_markdown import markdown_to_blocks, block_to_block_type, markdown_to_html_node, extract_title, extract_summary, iter_markdown_blocks, iter_text_nodes
 from htmlnode import HTMLNode
 from leafnode import LeafNode
 from parentnode import ParentNode
-from textnode import split_nodes_delimiter
+from textnode import TextNode, TextType, split_nodes_delimiter
 
 class TestMarkdownToBlocks(unittest.TestCase):
     def test_one_line(self):
@@ -114,6 +115,55 @@ And a paragraph at the end."""
         ]
         self.assertEqual(markdown_to_blocks(document), expected_output)
 
+class TestIterMarkdownBlocks(unittest.TestCase):
+    def test_matches_paragraph_splitting(self):
+        document = """\
+# This is a heading with some trailing white space     
+
+        And this is a paragraph of text with leading white space.
+
+* This is the start of a list
+* Second list item
+"""
+        self.assertEqual(list(iter_markdown_blocks(document)), markdown_to_blocks(document))
+
+    def test_code_block_with_blank_lines(self):
+        document = """\
+Some text
+
+```python
+def f():
+
+    return 1
+
+
+```
+
+After the code"""
+        expected_output = [
+            "Some text",
+            "```\ndef f():\n\n    return 1\n\n\n```",
+            "After the code"
+        ]
+        self.assertEqual(list(iter_markdown_blocks(document)), expected_output)
+
+    def test_code_fence_ends_paragraph(self):
+        document = "A paragraph\n```\ncode\n```\nmore text"
+        self.assertEqual(list(iter_markdown_blocks(document)), ["A paragraph", "```\ncode\n```", "more text"])
+
+    def test_unclosed_code_block(self):
+        self.assertEqual(list(iter_markdown_blocks("```\ncode")), ["```\ncode\n```"])
+
+    def test_inline_fences_stay_text(self):
+        document = "```inline``` code at the start of a paragraph"
+        self.assertEqual(list(iter_markdown_blocks(document)), [document])
+
+    def test_reads_file_object_lazily(self):
+        blocks = iter_markdown_blocks(io.StringIO("# Heading\n\nParagraph\n"))
+        self.assertEqual(next(blocks), "# Heading")
+        self.assertEqual(next(blocks), "Paragraph")
+        self.assertEqual(list(blocks), [])
+
 class TestBlockToBlockType(unittest.TestCase):
     def test_normal(self):
         document = """\
@@ -174,6 +224,10 @@ With some extra lines```
         self.assertEqual(block_to_block_type(document), "normal")
 
 class TestMarkdownToHTMLNode(unittest.TestCase):
+    def test_file_object(self):
+        markdown = "# Heading\n\nSome *text*\n"
+        self.assertEqual(markdown_to_html_node(io.StringIO(markdown)), markdown_to_html_node(markdown))
+
     def test_no_blocks(self):
         markdown = """\
 """
@@ -777,5 +831,28 @@ etc
             extract_title(markdown)
         
 
+class TestIterTextNodes(unittest.TestCase):
+    def test_block_markers_are_stripped(self):
+        markdown = "## Title\n\n> quoted *words*\n\n1. first\n2. second\n\n```\ncode\n```"
+        self.assertEqual(list(iter_text_nodes(markdown)), [
+            TextNode("Title", TextType.TEXT),
+            TextNode("quoted ", TextType.TEXT),
+            TextNode("words", TextType.ITALIC),
+            TextNode("first", TextType.TEXT),
+            TextNode("second", TextType.TEXT),
+            TextNode("code", TextType.CODE),
+        ])
+
+class TestExtractSummary(unittest.TestCase):
+    def test_first_paragraph_as_plain_text(self):
+        markdown = "# Title\n\n* a list\n\nThe **first** paragraph with [a link](/x)\nand a second line.\n\nMore text."
+        self.assertEqual(extract_summary(markdown), "The first paragraph with a link and a second line.")
+
+    def test_long_paragraph_is_cut_at_a_word(self):
+        self.assertEqual(extract_summary("# Title\n\n" + "word " * 100, 22), "word word word word…")
+
+    def test_no_paragraph(self):
+        self.assertEqual(extract_summary("# Title\n\n```\ncode\n```"), "")
+
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
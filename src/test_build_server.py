@@ -0,0 +1,81 @@
+import os
+import socket
+import tempfile
+import threading
+import unittest
+
+from build_server import BuildServer, request_build
+
+class FakeBuilder:
+    def __init__(self):
+        self.builds = 0
+
+    def build(self):
+        self.builds += 1
+        if self.builds == 2:
+            raise Exception("broken page")
+        return {"pages": self.builds}
+
+class TestBuildServer(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.socket_path = os.path.join(self.directory.name, "build.sock")
+        self.builder = FakeBuilder()
+        self.server = BuildServer(self.socket_path, self.builder)
+        self.thread = threading.Thread(target=self.server.serve)
+        self.thread.start()
+
+    def tearDown(self):
+        if self.server.running:
+            request_build(self.socket_path, "shutdown")
+        self.thread.join()
+        self.server.server_close()
+        self.directory.cleanup()
+
+    def test_builds_on_request(self):
+        self.assertEqual(request_build(self.socket_path, "ping"), {"ok": True})
+        self.assertEqual(request_build(self.socket_path), {"ok": True, "pages": 1})
+        with self.assertLogs("build_server", "ERROR"):
+            self.assertEqual(request_build(self.socket_path), {"ok": False, "error": "broken page"})
+        self.assertEqual(request_build(self.socket_path), {"ok": True, "pages": 3})
+
+    def test_unknown_command(self):
+        self.assertFalse(request_build(self.socket_path, "deploy")["ok"])
+        self.assertEqual(self.builder.builds, 0)
+
+    def test_shutdown_removes_socket(self):
+        self.assertEqual(request_build(self.socket_path, "shutdown"), {"ok": True})
+        self.thread.join()
+        self.server.server_close()
+        self.assertFalse(os.path.exists(self.socket_path))
+
+    def test_live_socket_is_not_taken_over(self):
+        with self.assertRaises(Exception):
+            BuildServer(self.socket_path, FakeBuilder())
+        self.assertEqual(request_build(self.socket_path, "ping"), {"ok": True})
+
+class TestSocketPath(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.socket_path = os.path.join(self.directory.name, "build.sock")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_regular_file_is_kept(self):
+        with open(self.socket_path, "w") as file:
+            file.write("<html></html>")
+        with self.assertRaises(Exception):
+            BuildServer(self.socket_path, FakeBuilder())
+        self.assertTrue(os.path.isfile(self.socket_path))
+
+    def test_stale_socket_is_replaced(self):
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as stale:
+            stale.bind(self.socket_path)
+        with self.assertLogs("build_server", "INFO"):
+            server = BuildServer(self.socket_path, FakeBuilder())
+        server.server_close()
+        self.assertFalse(os.path.exists(self.socket_path))
+
+if __name__ == "__main__":
+    unittest.main()
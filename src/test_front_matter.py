@@ -0,0 +1,65 @@
+import os
+import tempfile
+import unittest
+
+from front_matter import split_front_matter, read_metadata, parse_value
+
+class TestSplitFrontMatter(unittest.TestCase):
+    def test_yaml_style(self):
+        markdown = "---\ntitle: Tom\ndate: 2024-01-01\ntags: [books, \"fantasy\"]\ndraft: false\n---\n# Heading\n\nBody"
+        self.assertEqual(split_front_matter(markdown), (
+            {"title": "Tom", "date": "2024-01-01", "tags": ["books", "fantasy"], "draft": False},
+            "# Heading\n\nBody"))
+
+    def test_toml_style(self):
+        markdown = "+++\ntitle = \"Tom\"\ntemplate = \"blog\"\nweight = 3\n+++\nBody"
+        self.assertEqual(split_front_matter(markdown), ({"title": "Tom", "template": "blog", "weight": 3}, "Body"))
+
+    def test_block_list(self):
+        markdown = "---\ntags:\n  - books\n  - tolkien\ndraft: true\n---\nBody"
+        self.assertEqual(split_front_matter(markdown)[0], {"tags": ["books", "tolkien"], "draft": True})
+
+    def test_without_front_matter(self):
+        self.assertEqual(split_front_matter("# Title\n\n---\n"), ({}, "# Title\n\n---\n"))
+        self.assertEqual(split_front_matter("----\nnot front matter"), ({}, "----\nnot front matter"))
+
+    def test_closing_delimiter_must_be_whole_line(self):
+        markdown = "---\ntitle: a\n----\n---\nBody"
+        with self.assertRaises(Exception):
+            split_front_matter(markdown)
+        self.assertEqual(split_front_matter("---\ntitle: a\n---"), ({"title": "a"}, ""))
+
+    def test_unterminated(self):
+        with self.assertRaises(Exception):
+            split_front_matter("---\ntitle: Tom\n# Heading")
+
+    def test_parse_value(self):
+        self.assertEqual(parse_value("'quoted: text'"), "quoted: text")
+        self.assertEqual(parse_value("-12"), -12)
+        self.assertEqual(parse_value("[]"), [])
+
+class TestReadMetadata(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def write(self, text):
+        path = os.path.join(self.directory.name, "index.md")
+        with open(path, "w", encoding="utf-8") as file:
+            file.write(text)
+        return path
+
+    def test_reads_front_matter(self):
+        path = self.write("---\ntitle: Tom\ntags: [a, b]\n---\n# Other\n\nBody")
+        self.assertEqual(read_metadata(path), {"title": "Tom", "tags": ["a", "b"]})
+
+    def test_falls_back_to_first_heading(self):
+        self.assertEqual(read_metadata(self.write("---\ndate: 2024-01-01\n---\nIntro\n\n# Tom\n")),
+                         {"date": "2024-01-01", "title": "Tom"})
+        self.assertEqual(read_metadata(self.write("# Tom\n\nBody")), {"title": "Tom"})
+        self.assertEqual(read_metadata(self.write("No heading")), {})
+
+if __name__ == "__main__":
+    unittest.main()
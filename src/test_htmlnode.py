@@ -1,3 +1,4 @@
+import io
 import unittest
 
 from htmlnode import HTMLNode
@@ -126,6 +127,28 @@ class TestParentNode(unittest.TestCase):
             parent_node.to_html(), 
             "<html name=\"parent node with parent node with child_1\"><body name=\"parent node with child_1\"><h1 name=\"child 1\">this is a leaf node value</h1></body></html>")
 
+    def test_write_html_matches_to_html(self):
+        child_1 = LeafNode("a", "link", {"href": "/blog"})
+        child_2 = ParentNode("p", [LeafNode(None, "text"), LeafNode("b", "bold")])
+        parent_node = ParentNode("div", [child_1, child_2], {"name": "parent"})
+        buffer = io.StringIO()
+        parent_node.write_html(buffer)
+        self.assertEqual(buffer.getvalue(), parent_node.to_html())
+
+    def test_to_html_many_children(self):
+        parent_node = ParentNode("pre", [LeafNode("code", f"line {i}") for i in range(10000)])
+        html = parent_node.to_html()
+        self.assertTrue(html.startswith("<pre><code>line 0</code>"))
+        self.assertTrue(html.endswith("<code>line 9999</code></pre>"))
+
+    def test_nodes_have_no_instance_dict(self):
+        for node in [HTMLNode(), LeafNode("b", "bold"), ParentNode("p", [LeafNode(None, "text")])]:
+            self.assertFalse(hasattr(node, "__dict__"))
+
+    def test_write_html_not_implemented(self):
+        with self.assertRaises(NotImplementedError):
+            HTMLNode("p", "value").to_html()
+
 class TestTextNodeToHTMLNode(unittest.TestCase):
     def test_normal(self):
         text_node = TextNode("Standard text", TextType.TEXT)
@@ -159,6 +182,19 @@ class TestTextNodeToHTMLNode(unittest.TestCase):
         expected_output = HTMLNode("img", "", None, {"src": "https://www.google.co.uk/images/branding/googlelogo/2x/googlelogo_light_color_272x92dp.png", "alt": "Image alt text"})
         self.assertEqual(text_node_to_html_node(text_node), expected_output)
 
+    def test_link_with_nested_markup(self):
+        text_node = TextNode("the **bold** docs", TextType.LINK, "https://link.link/")
+        expected_output = ParentNode("a", [
+            LeafNode(None, "the "),
+            LeafNode("b", "bold"),
+            LeafNode(None, " docs")
+        ], {"href": "https://link.link/"})
+        self.assertEqual(text_node_to_html_node(text_node), expected_output)
+
+    def test_bold_with_nested_italic(self):
+        text_node = TextNode("bold and *italic*", TextType.BOLD)
+        self.assertEqual(text_node_to_html_node(text_node).to_html(), "<b>bold and <i>italic</i></b>")
+
     def test_exception(self):
         text_node = TextNode("Something something", "nope")
         with self.assertRaises(Exception):
@@ -0,0 +1,294 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from main import discover_pages, generate_multiple_pages, content_output_path, scan_metadata, SiteConfig, SiteBuilder
+from profiler import BuildProfiler
+from manifest import load_manifest
+
+TEMPLATE = "<title>{{ Title }}</title><a href=\"/index.css\"></a>{{ Content }}"
+
+class TestGenerateMultiplePages(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.root = self.directory.name
+        self.content_path = os.path.join(self.root, "content")
+        self.dest_path = os.path.join(self.root, "docs")
+        self.write(os.path.join(self.root, "template.html"), TEMPLATE)
+        self.write(os.path.join(self.content_path, "index.md"), "# Home\n\nWelcome home")
+        self.write(os.path.join(self.content_path, "blog", "first", "index.md"), "# First\n\nFirst post")
+        self.write(os.path.join(self.content_path, "blog", "second", "index.md"), "# Second\n\nSecond post")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def write(self, path, text):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as file:
+            file.write(text)
+
+    def read_outputs(self):
+        outputs = {}
+        for directory, _, files in os.walk(self.dest_path):
+            for file in files:
+                path = os.path.join(directory, file)
+                with open(path) as output_file:
+                    outputs[os.path.relpath(path, self.dest_path)] = output_file.read()
+        return outputs
+
+    def test_discover_pages_sorted(self):
+        self.assertEqual(discover_pages(self.content_path, self.dest_path), [
+            (os.path.join(self.content_path, "index.md"), os.path.join(self.dest_path, "index.html")),
+            (os.path.join(self.content_path, "blog", "first", "index.md"), os.path.join(self.dest_path, "blog", "first", "index.html")),
+            (os.path.join(self.content_path, "blog", "second", "index.md"), os.path.join(self.dest_path, "blog", "second", "index.html")),
+        ])
+
+    def test_discover_every_markdown_file_once(self):
+        self.write(os.path.join(self.content_path, "blog", "first", "image.png"), "not markdown")
+        self.write(os.path.join(self.content_path, "blog", "first", "notes.md"), "# Notes")
+        self.assertEqual(discover_pages(os.path.join(self.content_path, "blog", "first"), self.dest_path), [
+            (os.path.join(self.content_path, "blog", "first", "index.md"), os.path.join(self.dest_path, "index.html")),
+            (os.path.join(self.content_path, "blog", "first", "notes.md"), os.path.join(self.dest_path, "notes", "index.html")),
+        ])
+
+    def test_content_output_path(self):
+        self.assertEqual(content_output_path(os.path.join(self.content_path, "index.md"), self.content_path, self.dest_path),
+                         os.path.join(self.dest_path, "index.html"))
+        self.assertEqual(content_output_path(os.path.join(self.content_path, "blog", "post.md"), self.content_path, self.dest_path),
+                         os.path.join(self.dest_path, "blog", "post", "index.html"))
+
+    def test_generates_every_page(self):
+        generate_multiple_pages(self.content_path, self.root, self.dest_path, "/site/")
+        outputs = self.read_outputs()
+        self.assertEqual(sorted(outputs), [
+            os.path.join("blog", "first", "index.html"),
+            os.path.join("blog", "second", "index.html"),
+            "index.html",
+        ])
+        self.assertEqual(outputs["index.html"], "<title>Home</title><a href=\"/site/index.css\"></a><div><h1>Home</h1><p>Welcome home</p></div>")
+
+    def test_parallel_output_matches_serial(self):
+        generate_multiple_pages(self.content_path, self.root, self.dest_path, "/")
+        serial_outputs = self.read_outputs()
+        generate_multiple_pages(self.content_path, self.root, self.dest_path, "/", jobs=2)
+        self.assertEqual(self.read_outputs(), serial_outputs)
+
+    def test_profiled_output_matches_streamed(self):
+        generate_multiple_pages(self.content_path, self.root, self.dest_path, "/")
+        streamed_outputs = self.read_outputs()
+        profiler = BuildProfiler()
+        generate_multiple_pages(self.content_path, self.root, self.dest_path, "/", profiler=profiler)
+        self.assertEqual(self.read_outputs(), streamed_outputs)
+        self.assertEqual(len(profiler.page_totals()), 3)
+
+    def test_incremental_build_explains_rebuilds(self):
+        manifest = load_manifest(self.dest_path)
+        generate_multiple_pages(self.content_path, self.root, self.dest_path, "/", manifest)
+        manifest.save()
+        self.assertEqual(set(manifest.reasons.values()), {"new output"})
+
+        manifest = load_manifest(self.dest_path)
+        generate_multiple_pages(self.content_path, self.root, self.dest_path, "/", manifest)
+        self.assertEqual(manifest.reasons, {})
+
+        second_path = os.path.join(self.content_path, "blog", "second", "index.md")
+        self.write(second_path, "# Second\n\nAn edited second post")
+        manifest = load_manifest(self.dest_path)
+        generate_multiple_pages(self.content_path, self.root, self.dest_path, "/", manifest)
+        self.assertEqual(manifest.reasons, {os.path.join("blog", "second", "index.html"): f"{second_path} changed"})
+        template_path = os.path.join(self.root, "template.html")
+        self.assertEqual(len(manifest.dependents(template_path)), 3)
+
+    def test_directory_templates(self):
+        self.write(os.path.join(self.root, "blog.html"), "<article>{{ Content }}</article>")
+        generate_multiple_pages(self.content_path, self.root, self.dest_path, "/")
+        outputs = self.read_outputs()
+        self.assertEqual(outputs[os.path.join("blog", "first", "index.html")], "<article><div><h1>First</h1><p>First post</p></div></article>")
+        self.assertTrue(outputs["index.html"].startswith("<title>Home</title>"))
+
+    def test_front_matter(self):
+        self.write(os.path.join(self.root, "post.html"), "<h2>{{ Title }}</h2><p>{{ tags }}</p>{{ Content }}")
+        self.write(os.path.join(self.content_path, "blog", "first", "index.md"),
+                   "---\ntitle: Front\ntemplate: post\ntags: [a, b]\n---\n# First\n\nFirst post")
+        self.write(os.path.join(self.content_path, "blog", "second", "index.md"), "---\ndraft: true\n---\n# Second")
+        manifest = load_manifest(self.dest_path)
+        generate_multiple_pages(self.content_path, self.root, self.dest_path, "/", manifest)
+        outputs = self.read_outputs()
+        self.assertEqual(outputs[os.path.join("blog", "first", "index.html")],
+                         "<h2>Front</h2><p>a, b</p><div><h1>First</h1><p>First post</p></div>")
+        self.assertNotIn(os.path.join("blog", "second", "index.html"), outputs)
+        self.assertEqual(manifest.metadata(os.path.join(self.dest_path, "blog", "first", "index.html"))["template"], "post")
+
+        manifest.save()
+        manifest = load_manifest(self.dest_path)
+        generate_multiple_pages(self.content_path, self.root, self.dest_path, "/", manifest, drafts=True)
+        self.assertEqual(set(manifest.reasons), {os.path.join("blog", "second", "index.html")})
+
+        manifest.save()
+        manifest = load_manifest(self.dest_path)
+        generate_multiple_pages(self.content_path, self.root, self.dest_path, "/", manifest)
+        self.assertNotIn(os.path.join("blog", "second", "index.html"), self.read_outputs())
+        self.assertNotIn(os.path.join("blog", "second", "index.html"), manifest.entries)
+
+    def test_scan_metadata(self):
+        self.write(os.path.join(self.content_path, "blog", "first", "index.md"), "---\ntags: [a]\n---\n# First\n")
+        metadata = [(os.path.relpath(output_path, self.dest_path), metadata)
+                    for _, output_path, metadata, _ in scan_metadata(discover_pages(self.content_path, self.dest_path))]
+        self.assertEqual(metadata, [
+            ("index.html", {"title": "Home"}),
+            (os.path.join("blog", "first", "index.html"), {"tags": ["a"], "title": "First"}),
+            (os.path.join("blog", "second", "index.html"), {"title": "Second"}),
+        ])
+
+    def test_errors_are_aggregated(self):
+        self.write(os.path.join(self.content_path, "broken", "index.md"), "no heading")
+        self.write(os.path.join(self.content_path, "worse", "index.md"), "still no heading")
+        with self.assertRaises(Exception) as context:
+            generate_multiple_pages(self.content_path, self.root, self.dest_path, "/", jobs=2)
+        self.assertIn("2 of 5 pages failed", str(context.exception))
+        self.assertTrue(os.path.exists(os.path.join(self.dest_path, "blog", "second", "index.html")))
+
+    def test_duplicate_outputs_are_rejected(self):
+        self.write(os.path.join(self.content_path, "blog", "second.md"), "# Second again")
+        with self.assertRaises(Exception) as context:
+            discover_pages(self.content_path, self.dest_path)
+        self.assertIn(os.path.join(self.content_path, "blog", "second.md"), str(context.exception))
+        self.assertIn(os.path.join(self.content_path, "blog", "second", "index.md"), str(context.exception))
+
+class TestSiteBuilder(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.root = self.directory.name
+        self.write(os.path.join(self.root, "template.html"), TEMPLATE)
+        self.write(os.path.join(self.root, "content", "index.md"), "# Home\n\n[About](/about)")
+        self.write(os.path.join(self.root, "static", "index.css"), "body {}")
+        self.config = SiteConfig(os.path.join(self.root, "content"), os.path.join(self.root, "static"), self.root,
+                                 os.path.join(self.root, "docs"), "/site/", cache_path=os.path.join(self.root, "cache"))
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def write(self, path, text):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as file:
+            file.write(text)
+
+    def read(self, *parts):
+        with open(os.path.join(self.root, "docs", *parts)) as file:
+            return file.read()
+
+    def test_repeated_builds_reuse_state(self):
+        builder = SiteBuilder(self.config)
+        try:
+            result = builder.build()
+            self.assertEqual(result["pages"], 1)
+            self.assertEqual(result["rebuilt"], {"index.html": "full rebuild requested"})
+            self.assertIn("<a href=\"/site/about\">About</a>", self.read("index.html"))
+            self.assertEqual(self.read("index.css"), "body {}")
+            templates = builder.templates
+
+            self.assertEqual(builder.build()["rebuilt"], {})
+            self.assertIs(builder.templates, templates)
+
+            self.write(os.path.join(self.root, "content", "about.md"), "# About")
+            self.assertEqual(builder.build()["rebuilt"], {os.path.join("about", "index.html"): "new output"})
+            os.remove(os.path.join(self.root, "content", "about.md"))
+            builder.build()
+            self.assertFalse(os.path.exists(os.path.join(self.root, "docs", "about")))
+
+            self.write(os.path.join(self.root, "template.html"), "<main>{{ Content }}</main>")
+            self.assertEqual(set(builder.build()["rebuilt"]), {"index.html"})
+            self.assertIsNot(builder.templates, templates)
+        finally:
+            builder.close()
+
+    def test_fingerprinted_assets(self):
+        self.config.fingerprint = True
+        self.write(os.path.join(self.root, "content", "index.md"), "# Home\n\n![Tom](/images/tom.png)")
+        self.write(os.path.join(self.root, "static", "images", "tom.png"), "png")
+        builder = SiteBuilder(self.config)
+        try:
+            builder.build()
+            css_name = builder.url_rewriter.assets["index.css"]
+            self.assertIn(f"<a href=\"/site/{css_name}\"></a>", self.read("index.html"))
+            self.assertIn(f"src=\"/site/{builder.url_rewriter.assets['images/tom.png']}\"", self.read("index.html"))
+            self.assertFalse(os.path.exists(os.path.join(self.root, "docs", "index.css")))
+
+            self.write(os.path.join(self.root, "static", "index.css"), "main { margin: 0 }")
+            self.assertEqual(builder.build()["rebuilt"], {"index.html": "build options changed"})
+            self.assertNotEqual(builder.url_rewriter.assets["index.css"], css_name)
+            self.assertFalse(os.path.exists(os.path.join(self.root, "docs", css_name)))
+        finally:
+            builder.close()
+
+    def test_watch_rebuilds_reuse_the_worker_pool(self):
+        self.config.jobs = 2
+        builder = SiteBuilder(self.config)
+        try:
+            builder.build()
+            page_path = os.path.join(self.root, "content", "index.md")
+            self.write(page_path, "# Home\n\nEdited while watching")
+            with mock.patch("main.ProcessPoolExecutor", side_effect=AssertionError("new worker pool")):
+                builder.rebuild_changes([page_path], [])
+            self.assertIn("Edited while watching", self.read("index.html"))
+        finally:
+            builder.close()
+
+    def test_watch_after_full_build_only_renders_touched_pages(self):
+        blog_template_path = os.path.join(self.root, "blog.html")
+        self.write(blog_template_path, "<article>{{ Content }}</article>")
+        self.write(os.path.join(self.root, "content", "blog", "post.md"), "# Post")
+        builder = SiteBuilder(self.config)
+        try:
+            self.assertEqual(len(builder.build()["rebuilt"]), 2)
+            self.write(blog_template_path, "<section>{{ Content }}</section>")
+            rebuilt = builder.rebuild_changes([blog_template_path], [])
+            self.assertEqual(rebuilt, {os.path.join("blog", "post", "index.html"): f"{blog_template_path} changed"})
+            self.assertIn("<section>", self.read("blog", "post", "index.html"))
+        finally:
+            builder.close()
+
+    def test_watch_rebuilds_update_site_indexes(self):
+        self.config.site_url = "https://example.com"
+        builder = SiteBuilder(self.config)
+        try:
+            builder.build()
+            about_path = os.path.join(self.root, "content", "about.md")
+            self.write(about_path, "# About")
+            builder.rebuild_changes([about_path], [])
+            self.assertIn("https://example.com/site/about/", self.read("sitemap.xml"))
+            self.assertIn("\"title\":\"About\"", self.read("search-index.json"))
+            os.remove(about_path)
+            builder.rebuild_changes([], [about_path])
+            self.assertNotIn("/about/", self.read("sitemap.xml"))
+            self.assertNotIn("<title>About</title>", self.read("feed.xml"))
+        finally:
+            builder.close()
+
+    def test_watch_rebuilds_update_the_search_index(self):
+        self.config.search = True
+        builder = SiteBuilder(self.config)
+        try:
+            builder.build()
+            about_path = os.path.join(self.root, "content", "about.md")
+            self.write(about_path, "# About\n\nHobbits")
+            builder.rebuild_changes([about_path], [])
+            self.assertIn("/site/about/", self.read("search", "documents.json"))
+            self.assertIn("\"hobbits\"", self.read("search", "terms", "ho.json"))
+        finally:
+            builder.close()
+
+    def test_staged_build(self):
+        self.config.staging = True
+        builder = SiteBuilder(self.config)
+        try:
+            builder.build()
+            builder.build()
+        finally:
+            builder.close()
+        self.assertEqual(sorted(os.listdir(self.root)), ["cache", "content", "docs", "static", "template.html"])
+        self.assertEqual(self.read("index.css"), "body {}")
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,132 @@
+import hashlib
+import os
+import tempfile
+import unittest
+
+from manifest import BuildManifest, load_manifest, hash_bytes, hash_file
+
+class TestHashing(unittest.TestCase):
+    def test_hash_bytes_accepts_str_and_bytes(self):
+        self.assertEqual(hash_bytes("abc"), hash_bytes(b"abc"))
+
+    def test_hash_bytes_separates_parts(self):
+        self.assertNotEqual(hash_bytes("ab", "c"), hash_bytes("a", "bc"))
+
+    def test_hash_file_matches_contents(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "file.txt")
+            with open(path, "wb") as file:
+                file.write(b"content")
+            original_hash = hash_file(path)
+            self.assertEqual(original_hash, hashlib.sha256(b"content").hexdigest())
+            with open(path, "wb") as file:
+                file.write(b"changed")
+            self.assertEqual(hash_file(path), hashlib.sha256(b"changed").hexdigest())
+            self.assertNotEqual(hash_file(path), original_hash)
+
+class TestBuildManifest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.dest_path = self.directory.name
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def write_output(self, relative_path):
+        output_path = os.path.join(self.dest_path, relative_path)
+        os.makedirs(os.path.dirname(output_path), exist_ok=True)
+        with open(output_path, "w") as file:
+            file.write("output")
+        return output_path
+
+    def test_new_output_is_not_current(self):
+        manifest = BuildManifest(self.dest_path)
+        self.assertFalse(manifest.is_current(os.path.join(self.dest_path, "index.html"), "hash"))
+
+    def test_recorded_output_is_current_after_reload(self):
+        output_path = self.write_output("index.html")
+        manifest = BuildManifest(self.dest_path)
+        manifest.record("content/index.md", output_path, "hash")
+        manifest.save()
+        reloaded = load_manifest(self.dest_path)
+        self.assertTrue(reloaded.is_current(output_path, "hash"))
+        self.assertFalse(reloaded.is_current(output_path, "other hash"))
+
+    def test_missing_output_is_not_current(self):
+        manifest = BuildManifest(self.dest_path)
+        manifest.record("content/index.md", os.path.join(self.dest_path, "index.html"), "hash")
+        self.assertFalse(manifest.is_current(os.path.join(self.dest_path, "index.html"), "hash"))
+
+    def test_remove_stale_outputs(self):
+        kept_path = self.write_output("index.html")
+        stale_path = self.write_output(os.path.join("blog", "old", "index.html"))
+        manifest = BuildManifest(self.dest_path)
+        manifest.record("content/index.md", kept_path, "hash")
+        manifest.record("content/blog/old/index.md", stale_path, "hash")
+        manifest.save()
+
+        manifest = load_manifest(self.dest_path)
+        manifest.is_current(kept_path, "hash")
+        self.assertEqual(manifest.remove_stale_outputs(), [stale_path])
+        self.assertTrue(os.path.exists(kept_path))
+        self.assertFalse(os.path.exists(os.path.join(self.dest_path, "blog")))
+        self.assertEqual(list(manifest.entries), ["index.html"])
+
+    def test_rebuild_treats_recorded_outputs_as_stale(self):
+        output_path = self.write_output("index.html")
+        manifest = BuildManifest(self.dest_path)
+        manifest.record("content/index.md", output_path, "hash")
+        manifest.save()
+        self.assertFalse(load_manifest(self.dest_path, rebuild=True).is_current(output_path, "hash"))
+
+    def test_remove_untracked_outputs(self):
+        kept_path = self.write_output("index.html")
+        untracked_path = self.write_output(os.path.join("leftover", "index.html"))
+        manifest = BuildManifest(self.dest_path)
+        manifest.record("content/index.md", kept_path, "hash")
+        manifest.save()
+        self.assertEqual(manifest.remove_untracked_outputs(), [untracked_path])
+        self.assertTrue(os.path.exists(kept_path))
+        self.assertTrue(os.path.exists(os.path.join(self.dest_path, ".ssg-manifest.json")))
+        self.assertFalse(os.path.exists(os.path.join(self.dest_path, "leftover")))
+
+    def test_stale_reason_compares_dependencies(self):
+        output_path = self.write_output("index.html")
+        manifest = BuildManifest(self.dest_path)
+        self.assertEqual(manifest.stale_reason(output_path, {"index.md": "1:1"}, "base_path:/"), "new output")
+        manifest.record("index.md", output_path, "hash", {"index.md": "1:1", "template.html": "2:2"}, "base_path:/")
+        manifest.save()
+
+        manifest = load_manifest(self.dest_path)
+        self.assertIsNone(manifest.stale_reason(output_path, {"index.md": "1:1", "template.html": "2:2"}, "base_path:/"))
+        self.assertEqual(manifest.stale_reason(output_path, {"index.md": "1:1", "template.html": "3:3"}, "base_path:/"),
+                         "template.html changed")
+        self.assertEqual(manifest.stale_reason(output_path, {"index.md": "1:1", "template.html": "2:2"}, "base_path:/site/"),
+                         "build options changed")
+        self.assertEqual(manifest.stale_reason(output_path, {"index.md": "1:1"}, "base_path:/"),
+                         "no longer depends on template.html")
+        os.remove(output_path)
+        self.assertEqual(manifest.stale_reason(output_path, {"index.md": "1:1", "template.html": "2:2"}, "base_path:/"),
+                         "output is missing")
+
+    def test_dependents(self):
+        first_path = os.path.join(self.dest_path, "first", "index.html")
+        second_path = os.path.join(self.dest_path, "second", "index.html")
+        manifest = BuildManifest(self.dest_path)
+        manifest.record("first.md", first_path, "hash", {"first.md": "1", "template.html": "1"})
+        manifest.record("second.md", second_path, "hash", {"second.md": "1", "template.html": "1"})
+        self.assertEqual(manifest.dependents("template.html"), [("first.md", first_path), ("second.md", second_path)])
+        self.assertEqual(manifest.dependents("second.md"), [("second.md", second_path)])
+        manifest.record("second.md", second_path, "hash", {"second.md": "1", "other.html": "1"})
+        self.assertEqual(manifest.dependents("template.html"), [("first.md", first_path)])
+        manifest.remove_output(first_path)
+        self.assertEqual(manifest.dependents("template.html"), [])
+        self.assertEqual(manifest.dependents("unknown.md"), [])
+
+    def test_corrupt_manifest_starts_empty(self):
+        with open(os.path.join(self.dest_path, ".ssg-manifest.json"), "w") as file:
+            file.write("{not json")
+        self.assertEqual(load_manifest(self.dest_path).entries, {})
+
+if __name__ == "__main__":
+    unittest.main()
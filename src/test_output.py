@@ -0,0 +1,102 @@
+import os
+import sys
+import tempfile
+import unittest
+
+from output import write_output, open_output, staging_path, prepare_staging, swap_staging, exchange_paths
+
+class TestWriteOutput(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.root = self.directory.name
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def read(self, path):
+        with open(path, encoding="utf-8") as file:
+            return file.read()
+
+    def test_writes_utf8_and_creates_directories(self):
+        output_path = os.path.join(self.root, "blog", "index.html")
+        self.assertTrue(write_output(output_path, "<p>café</p>"))
+        self.assertEqual(self.read(output_path), "<p>café</p>")
+        self.assertEqual(os.listdir(os.path.dirname(output_path)), ["index.html"])
+
+    def test_identical_contents_are_not_rewritten(self):
+        output_path = os.path.join(self.root, "index.html")
+        write_output(output_path, "<p>same</p>")
+        os.utime(output_path, ns=(1_000_000_000, 1_000_000_000))
+        self.assertFalse(write_output(output_path, "<p>same</p>"))
+        self.assertEqual(os.stat(output_path).st_mtime_ns, 1_000_000_000)
+
+    def test_changed_contents_replace_the_file(self):
+        output_path = os.path.join(self.root, "index.html")
+        write_output(output_path, "<p>old</p>")
+        linked_path = os.path.join(self.root, "linked.html")
+        os.link(output_path, linked_path)
+        self.assertTrue(write_output(output_path, "<p>new</p>"))
+        self.assertEqual(self.read(output_path), "<p>new</p>")
+        self.assertEqual(self.read(linked_path), "<p>old</p>")
+
+    def test_open_output_streams_and_skips_identical_files(self):
+        output_path = os.path.join(self.root, "feed.xml")
+        with open_output(output_path) as output_file:
+            output_file.write("<rss>")
+            output_file.write("</rss>")
+        self.assertEqual(self.read(output_path), "<rss></rss>")
+        os.utime(output_path, ns=(1_000_000_000, 1_000_000_000))
+        with open_output(output_path) as output_file:
+            output_file.write("<rss></rss>")
+        self.assertEqual(os.stat(output_path).st_mtime_ns, 1_000_000_000)
+        with self.assertRaises(ValueError):
+            with open_output(output_path) as output_file:
+                output_file.write("partial")
+                raise ValueError("failed")
+        self.assertEqual(self.read(output_path), "<rss></rss>")
+        self.assertEqual(os.listdir(self.root), ["feed.xml"])
+
+class TestStaging(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.dest_path = os.path.join(self.directory.name, "docs")
+        self.stage_path = staging_path(self.dest_path)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_staging_starts_as_a_copy_and_is_swapped_in(self):
+        write_output(os.path.join(self.dest_path, "index.html"), "<p>live</p>")
+        write_output(os.path.join(self.dest_path, "blog", "index.html"), "<p>blog</p>")
+        prepare_staging(self.dest_path, self.stage_path)
+        self.assertEqual(self.stage_path, self.dest_path + ".staging")
+        write_output(os.path.join(self.stage_path, "index.html"), "<p>staged</p>")
+        with open(os.path.join(self.dest_path, "index.html")) as file:
+            self.assertEqual(file.read(), "<p>live</p>")
+
+        swap_staging(self.stage_path, self.dest_path)
+        self.assertFalse(os.path.exists(self.stage_path))
+        self.assertEqual(sorted(os.listdir(self.directory.name)), ["docs"])
+        with open(os.path.join(self.dest_path, "index.html")) as file:
+            self.assertEqual(file.read(), "<p>staged</p>")
+        with open(os.path.join(self.dest_path, "blog", "index.html")) as file:
+            self.assertEqual(file.read(), "<p>blog</p>")
+
+    @unittest.skipUnless(sys.platform.startswith("linux"), "directory exchange needs renameat2")
+    def test_exchange_paths(self):
+        write_output(os.path.join(self.dest_path, "index.html"), "<p>live</p>")
+        write_output(os.path.join(self.stage_path, "index.html"), "<p>staged</p>")
+        dest_inode = os.stat(self.dest_path).st_ino
+        self.assertTrue(exchange_paths(self.stage_path, self.dest_path))
+        self.assertEqual(os.stat(self.stage_path).st_ino, dest_inode)
+        with open(os.path.join(self.dest_path, "index.html")) as file:
+            self.assertEqual(file.read(), "<p>staged</p>")
+
+    def test_staging_without_existing_output(self):
+        prepare_staging(self.dest_path, self.stage_path)
+        write_output(os.path.join(self.stage_path, "index.html"), "<p>first</p>")
+        swap_staging(self.stage_path, self.dest_path)
+        self.assertEqual(os.listdir(self.dest_path), ["index.html"])
+
+if __name__ == "__main__":
+    unittest.main()
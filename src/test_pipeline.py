@@ -0,0 +1,61 @@
+import os
+import tempfile
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from pipeline import bounded_map, WriteQueue
+
+class TestBoundedMap(unittest.TestCase):
+    def test_results_in_input_order(self):
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            results = list(bounded_map(executor, lambda item: item * 2, range(10), 3))
+        self.assertEqual(results, [(item, item * 2, None) for item in range(10)])
+
+    def test_errors_are_returned(self):
+        def fail_on_two(item):
+            if item == 2:
+                raise ValueError("two")
+            return item
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            results = list(bounded_map(executor, fail_on_two, range(4), 2))
+        self.assertEqual([item for item, _, error in results if error is not None], [2])
+        self.assertEqual(str(results[2][2]), "two")
+
+    def test_input_consumed_lazily(self):
+        consumed = []
+        def items():
+            for item in range(100):
+                consumed.append(item)
+                yield item
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            results = bounded_map(executor, lambda item: item, items(), 4)
+            next(results)
+            self.assertLessEqual(len(consumed), 4)
+            results.close()
+
+class TestWriteQueue(unittest.TestCase):
+    def test_writes_and_reports_every_page(self):
+        with tempfile.TemporaryDirectory() as directory:
+            writer = WriteQueue(workers=3, depth=2)
+            for index in range(20):
+                writer.put(index, os.path.join(directory, str(index), "index.html"), f"<p>{index}</p>")
+            results = writer.finished() + writer.close()
+            self.assertEqual(sorted(tag for tag, _ in results), list(range(20)))
+            self.assertTrue(all(error is None for _, error in results))
+            with open(os.path.join(directory, "7", "index.html")) as file:
+                self.assertEqual(file.read(), "<p>7</p>")
+
+    def test_write_errors_are_reported(self):
+        with tempfile.TemporaryDirectory() as directory:
+            blocking_file = os.path.join(directory, "file")
+            with open(blocking_file, "w") as file:
+                file.write("not a directory")
+            writer = WriteQueue(workers=1)
+            writer.put("page", os.path.join(blocking_file, "index.html"), "<p></p>")
+            [(tag, error)] = writer.close()
+            self.assertEqual(tag, "page")
+            self.assertIsInstance(error, OSError)
+            self.assertFalse(any(thread.is_alive() for thread in writer.threads))
+
+if __name__ == "__main__":
+    unittest.main()
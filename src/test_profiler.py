@@ -0,0 +1,57 @@
+import json
+import os
+import tempfile
+import unittest
+
+from profiler import BuildProfiler, DISABLED_PROFILER
+
+class TestBuildProfiler(unittest.TestCase):
+    def test_records_stages(self):
+        profiler = BuildProfiler()
+        with profiler.stage("read", "index.html"):
+            pass
+        with profiler.stage("read", "blog/index.html"):
+            pass
+        with profiler.stage("discovery"):
+            pass
+        totals = dict(profiler.stage_totals())
+        self.assertEqual(totals["read"][0], 2)
+        self.assertEqual(totals["discovery"][0], 1)
+        self.assertEqual(sorted(page for page, _ in profiler.page_totals()), ["blog/index.html", "index.html"])
+
+    def test_disabled_profiler_records_nothing(self):
+        with DISABLED_PROFILER.stage("read", "index.html"):
+            pass
+        DISABLED_PROFILER.merge([("read", "index.html", 0, 1, 1, 1)])
+        self.assertEqual(DISABLED_PROFILER.events, [])
+
+    def test_records_stage_when_it_raises(self):
+        profiler = BuildProfiler()
+        with self.assertRaises(ValueError):
+            with profiler.stage("inline parse", "index.html"):
+                raise ValueError("bad markdown")
+        self.assertEqual(len(profiler.events), 1)
+
+    def test_merge_and_report(self):
+        profiler = BuildProfiler()
+        profiler.merge([("serialize", "slow.html", 0, 5000000, 4000000, 1), ("serialize", "fast.html", 0, 1000000, 1000000, 1)])
+        report = profiler.report(limit=1)
+        self.assertIn("serialize", report)
+        self.assertIn("slow.html", report)
+        self.assertNotIn("fast.html", report)
+
+    def test_write_trace(self):
+        profiler = BuildProfiler()
+        with profiler.stage("write", "index.html"):
+            pass
+        with tempfile.TemporaryDirectory() as directory:
+            trace_path = os.path.join(directory, "trace.json")
+            profiler.write_trace(trace_path)
+            with open(trace_path) as trace_file:
+                trace = json.load(trace_file)
+        self.assertEqual(trace["traceEvents"][0]["name"], "write")
+        self.assertEqual(trace["traceEvents"][0]["ph"], "X")
+        self.assertEqual(trace["traceEvents"][0]["args"]["page"], "index.html")
+
+if __name__ == "__main__":
+    unittest.main()
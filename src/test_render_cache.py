@@ -0,0 +1,49 @@
+import tempfile
+import unittest
+
+from render_cache import RenderCache
+
+class TestRenderCache(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_miss_then_hit(self):
+        cache = RenderCache(self.directory.name)
+        self.assertIsNone(cache.get("# Home", "/"))
+        cache.put("# Home", "/", "Home", "<div><h1>Home</h1></div>")
+        self.assertEqual(cache.get("# Home", "/"), ("Home", "<div><h1>Home</h1></div>"))
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+        cache.close()
+
+    def test_persists_between_builds(self):
+        cache = RenderCache(self.directory.name)
+        cache.put("# Home", "/", "Home", "<div></div>")
+        cache.close()
+        cache = RenderCache(self.directory.name)
+        self.assertEqual(cache.get("# Home", "/"), ("Home", "<div></div>"))
+        cache.close()
+
+    def test_keyed_by_base_path(self):
+        cache = RenderCache(self.directory.name)
+        cache.put("# Home", "/", "Home", "<a href=\"/blog\"></a>")
+        self.assertIsNone(cache.get("# Home", "/site/"))
+        cache.close()
+
+    def test_evicts_least_recently_used(self):
+        cache = RenderCache(self.directory.name, max_bytes=35)
+        cache.put("old", "/", "Old", "<p>old</p>")
+        cache.put("new", "/", "New", "<p>new</p>")
+        cache.commit()
+        cache.get("old", "/")
+        cache.commit()
+        cache.put("newest", "/", "Newest", "<p>newest</p>")
+        self.assertEqual(cache.evict(), 1)
+        self.assertIsNone(cache.get("new", "/"))
+        self.assertIsNotNone(cache.get("old", "/"))
+        cache.close()
+
+if __name__ == "__main__":
+    unittest.main()
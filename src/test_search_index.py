@@ -0,0 +1,104 @@
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from manifest import BuildManifest, hash_bytes
+from search_index import write_search_index, read_page_terms, page_terms, shard_name
+from urls import BasePathRewriter
+
+class TestPageTerms(unittest.TestCase):
+    def test_terms_come_from_text_nodes(self):
+        markdown = "---\ntitle: Hidden\n---\n# Hello World\n\n* a **bold** [link text](/url/path)\n\n```\nprint_value\n```"
+        self.assertEqual(page_terms(markdown), {"hello": 1, "world": 1, "bold": 1, "link": 1, "text": 1, "print": 1, "value": 1})
+
+    def test_terms_are_case_folded_and_counted(self):
+        self.assertEqual(page_terms("Search SEARCH search, x"), {"search": 3})
+
+    def test_shard_names(self):
+        self.assertEqual(shard_name("search"), "se")
+        self.assertEqual(shard_name("été"), "c3a974")
+
+class TestSearchIndex(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.dest_path = os.path.join(self.directory.name, "public")
+        self.manifest = BuildManifest(self.dest_path)
+        self.pages = {
+            "index.md": "# Home\n\nWelcome to the search docs",
+            "guide.md": "# Guide\n\nSearch loads only the shards it needs. Search!",
+            "about.md": "# About\n\nNothing to see",
+        }
+        for name, markdown in self.pages.items():
+            self.add_page(name, markdown)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def add_page(self, name, markdown):
+        source_path = os.path.join(self.directory.name, name)
+        with open(source_path, "w") as markdown_file:
+            markdown_file.write(markdown)
+        key = "index.html" if name == "index.md" else os.path.join(name[:-3], "index.html")
+        metadata = {"title": markdown.split("\n")[0][2:]}
+        self.manifest.record(source_path, os.path.join(self.dest_path, key), markdown, {source_path: hash_bytes(markdown)},
+                             metadata=metadata)
+
+    def read_json(self, *names):
+        with open(os.path.join(self.dest_path, "search", *names), encoding="utf-8") as index_file:
+            return json.load(index_file)
+
+    def test_writes_sharded_index_from_partial_runs(self):
+        self.assertTrue(write_search_index(self.manifest, BasePathRewriter("/site/"), chunk_pages=1))
+        documents = self.read_json("documents.json")
+        self.assertEqual(sorted(documents), [["/site/", "Home"], ["/site/about/", "About"], ["/site/guide/", "Guide"]])
+        about, guide, home = [documents.index(document) for document in sorted(documents, key=lambda document: document[1])]
+        search_manifest = self.read_json("shards.json")
+        self.assertEqual(search_manifest["prefix_length"], 2)
+        self.assertIn("se", search_manifest["shards"])
+        shard = self.read_json("terms", "se.json")
+        self.assertEqual(shard, {"search": sorted([[guide, 2], [home, 1]]), "see": [[about, 1]]})
+        self.assertEqual(self.read_json("terms", "to.json"), {"to": sorted([[about, 1], [home, 1]])})
+        self.assertEqual(sorted(os.listdir(os.path.join(self.dest_path, "search", "terms"))),
+                         sorted(f"{name}.json" for name in search_manifest["shards"]))
+
+    def test_only_changed_pages_are_tokenized(self):
+        cache_path = os.path.join(self.directory.name, "cache")
+        write_search_index(self.manifest, BasePathRewriter(), cache_path=cache_path, chunk_pages=1)
+        run_directory = os.path.join(cache_path, "search")
+        run_count = len([name for name in os.listdir(run_directory) if name.endswith(".run")])
+        self.manifest.begin_build()
+        self.add_page("guide.md", "# Guide\n\nGuides are rewritten")
+        for key in list(self.manifest.entries):
+            self.manifest.seen.add(key)
+        with mock.patch("search_index.read_page_terms", wraps=read_page_terms) as read_terms:
+            self.assertTrue(write_search_index(self.manifest, BasePathRewriter(), cache_path=cache_path, chunk_pages=1))
+        self.assertEqual([call.args[0][0] for call in read_terms.call_args_list], [os.path.join("guide", "index.html")])
+        self.assertEqual(len([name for name in os.listdir(run_directory) if name.endswith(".run")]), run_count)
+        documents = self.read_json("documents.json")
+        self.assertEqual(self.read_json("terms", "gu.json"), {"guide": [[documents.index(["/guide/", "Guide"]), 1]],
+                                                              "guides": [[documents.index(["/guide/", "Guide"]), 1]]})
+
+    def test_unchanged_pages_skip_the_rebuild(self):
+        write_search_index(self.manifest, BasePathRewriter())
+        self.manifest.begin_build()
+        for key in list(self.manifest.entries):
+            if self.manifest.entries[key]["source"] != "search index":
+                self.manifest.seen.add(key)
+        self.assertFalse(write_search_index(self.manifest, BasePathRewriter()))
+        self.assertEqual(self.manifest.remove_stale_outputs(), [])
+
+    def test_removed_terms_drop_their_shards(self):
+        write_search_index(self.manifest, BasePathRewriter())
+        self.manifest.begin_build()
+        self.add_page("about.md", "# About\n\nThe docs")
+        self.add_page("guide.md", "# Guide\n\nThe docs")
+        self.add_page("index.md", "# Home\n\nThe docs")
+        self.assertTrue(write_search_index(self.manifest, BasePathRewriter()))
+        removed = self.manifest.remove_stale_outputs()
+        self.assertIn(os.path.join(self.dest_path, "search", "terms", "se.json"), removed)
+        self.assertEqual(self.read_json("terms", "do.json"), {"docs": [[0, 1], [1, 1], [2, 1]]})
+
+if __name__ == "__main__":
+    unittest.main()
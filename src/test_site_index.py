@@ -0,0 +1,70 @@
+import json
+import os
+import tempfile
+import unittest
+
+from manifest import BuildManifest
+from site_index import write_site_indexes, page_url
+from urls import BasePathRewriter
+
+class TestSiteIndexes(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.dest_path = self.directory.name
+        self.manifest = BuildManifest(self.dest_path)
+        self.record("index.md", "index.html", {"title": "Home", "summary": "Welcome & hello", "modified": 86400})
+        self.record("blog/tom.md", os.path.join("blog", "tom", "index.html"),
+                    {"title": "Tom", "summary": "About Tom", "date": "2024-05-01", "tags": ["books"], "modified": 0})
+        self.record("blog/old.md", os.path.join("blog", "old", "index.html"),
+                    {"title": "Old", "summary": "", "date": "2020-01-01", "modified": 0})
+        self.manifest.record("static/index.css", os.path.join(self.dest_path, "index.css"), "1:1")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def record(self, source, key, metadata):
+        self.manifest.record(source, os.path.join(self.dest_path, key), "hash", {source: "1:1"}, metadata=metadata)
+
+    def read(self, name):
+        with open(os.path.join(self.dest_path, name), encoding="utf-8") as file:
+            return file.read()
+
+    def test_page_url(self):
+        rewriter = BasePathRewriter("/site/")
+        self.assertEqual(page_url("index.html", rewriter), "/site/")
+        self.assertEqual(page_url(os.path.join("blog", "tom", "index.html"), rewriter), "/site/blog/tom/")
+
+    def test_writes_every_index(self):
+        self.assertEqual(write_site_indexes(self.manifest, BasePathRewriter("/site/"), "https://example.com/", "Example"), 3)
+        sitemap = self.read("sitemap.xml")
+        self.assertIn("<url><loc>https://example.com/site/</loc><lastmod>1970-01-02</lastmod></url>", sitemap)
+        self.assertIn("<url><loc>https://example.com/site/blog/tom/</loc><lastmod>2024-05-01</lastmod></url>", sitemap)
+        self.assertNotIn("index.css", sitemap)
+
+        search_index = json.loads(self.read("search-index.json"))
+        self.assertEqual(search_index[2], {"url": "/site/", "title": "Home", "summary": "Welcome & hello", "tags": []})
+
+        feed = self.read("feed.xml")
+        self.assertIn("<title>Example</title>", feed)
+        self.assertIn("<description>Welcome &amp; hello</description>", feed)
+        self.assertLess(feed.index("<title>Tom</title>"), feed.index("<title>Home</title>"))
+        self.assertIn("<pubDate>Wed, 01 May 2024 00:00:00 +0000</pubDate>", feed)
+        self.assertEqual(self.manifest.entries["sitemap.xml"]["source"], "site index")
+
+    def test_feed_limit_and_unchanged_files(self):
+        write_site_indexes(self.manifest, BasePathRewriter(), "https://example.com", feed_limit=1)
+        feed = self.read("feed.xml")
+        self.assertEqual(feed.count("<item>"), 1)
+        self.assertIn("<title>Tom</title>", feed)
+        sitemap_path = os.path.join(self.dest_path, "sitemap.xml")
+        os.utime(sitemap_path, ns=(1_000_000_000, 1_000_000_000))
+        write_site_indexes(self.manifest, BasePathRewriter(), "https://example.com", feed_limit=1)
+        self.assertEqual(os.stat(sitemap_path).st_mtime_ns, 1_000_000_000)
+
+    def test_pages_not_seen_this_build_are_left_out(self):
+        self.manifest.seen.discard(os.path.join("blog", "old", "index.html"))
+        write_site_indexes(self.manifest, BasePathRewriter(), "https://example.com")
+        self.assertNotIn("/blog/old/", self.read("sitemap.xml"))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,87 @@
+import os
+import tempfile
+import unittest
+
+from manifest import BuildManifest
+from static_sync import sync_static, needs_copy
+
+class TestSyncStatic(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.static_path = os.path.join(self.directory.name, "static")
+        self.dest_path = os.path.join(self.directory.name, "docs")
+        self.css_path = self.write(os.path.join(self.static_path, "index.css"), "body {}")
+        self.image_path = self.write(os.path.join(self.static_path, "images", "tom.png"), "png")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def write(self, path, text):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as file:
+            file.write(text)
+        return path
+
+    def read(self, path):
+        with open(path) as file:
+            return file.read()
+
+    def test_copies_tree(self):
+        sync_static(self.static_path, self.dest_path)
+        self.assertEqual(self.read(os.path.join(self.dest_path, "index.css")), "body {}")
+        self.assertEqual(self.read(os.path.join(self.dest_path, "images", "tom.png")), "png")
+
+    def test_unchanged_files_are_not_copied(self):
+        sync_static(self.static_path, self.dest_path)
+        self.assertFalse(needs_copy(self.css_path, os.path.join(self.dest_path, "index.css")))
+        self.write(self.css_path, "body { color: red; }")
+        self.assertTrue(needs_copy(self.css_path, os.path.join(self.dest_path, "index.css")))
+
+    def test_checksum_skips_touched_files(self):
+        sync_static(self.static_path, self.dest_path)
+        stat_result = os.stat(self.css_path)
+        os.utime(self.css_path, ns=(stat_result.st_atime_ns, stat_result.st_mtime_ns + 10**9))
+        destination_css_path = os.path.join(self.dest_path, "index.css")
+        self.assertTrue(needs_copy(self.css_path, destination_css_path))
+        self.assertFalse(needs_copy(self.css_path, destination_css_path, checksum=True))
+        self.assertFalse(needs_copy(self.css_path, destination_css_path))
+
+    def test_checksum_does_not_touch_linked_files(self):
+        sync_static(self.static_path, self.dest_path)
+        destination_css_path = os.path.join(self.dest_path, "index.css")
+        linked_path = os.path.join(self.directory.name, "live.css")
+        os.link(destination_css_path, linked_path)
+        live_mtime = os.stat(linked_path).st_mtime_ns
+        stat_result = os.stat(self.css_path)
+        os.utime(self.css_path, ns=(stat_result.st_atime_ns, stat_result.st_mtime_ns + 10**9))
+        sync_static(self.static_path, self.dest_path, checksum=True)
+        self.assertEqual(os.stat(linked_path).st_mtime_ns, live_mtime)
+        self.assertEqual(os.stat(destination_css_path).st_mtime_ns, stat_result.st_mtime_ns + 10**9)
+
+    def test_hardlinks(self):
+        sync_static(self.static_path, self.dest_path, link=True)
+        self.assertTrue(os.path.samefile(self.css_path, os.path.join(self.dest_path, "index.css")))
+
+    def test_copy_replaces_instead_of_writing_through_links(self):
+        sync_static(self.static_path, self.dest_path)
+        destination_css_path = os.path.join(self.dest_path, "index.css")
+        linked_path = os.path.join(self.directory.name, "live.css")
+        os.link(destination_css_path, linked_path)
+        self.write(self.css_path, "body { color: red; }")
+        sync_static(self.static_path, self.dest_path)
+        self.assertEqual(self.read(destination_css_path), "body { color: red; }")
+        self.assertEqual(self.read(linked_path), "body {}")
+        self.assertEqual(sorted(os.listdir(self.dest_path)), ["images", "index.css"])
+
+    def test_thread_pool_and_stale_removal(self):
+        manifest = BuildManifest(self.dest_path)
+        sync_static(self.static_path, self.dest_path, manifest, workers=4)
+        manifest.save()
+        os.remove(self.image_path)
+        manifest = BuildManifest(self.dest_path, manifest.entries)
+        sync_static(self.static_path, self.dest_path, manifest, workers=4)
+        self.assertEqual(manifest.remove_stale_outputs(), [os.path.join(self.dest_path, "images", "tom.png")])
+        self.assertTrue(os.path.exists(os.path.join(self.dest_path, "index.css")))
+
+if __name__ == "__main__":
+    unittest.main()
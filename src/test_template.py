@@ -0,0 +1,90 @@
+import io
+import os
+import tempfile
+import unittest
+
+from template import Template, TemplateIndex
+from leafnode import LeafNode
+from parentnode import ParentNode
+from block_markdown import markdown_to_html_node
+from urls import BasePathRewriter
+
+class TestTemplate(unittest.TestCase):
+    def test_compiles_literals_and_slots(self):
+        template = Template("<title>{{ Title }}</title><body>{{ Content }}</body>")
+        self.assertEqual(template.literals, ["<title>", "</title><body>", "</body>"])
+        self.assertEqual([name for name, _ in template.slots], ["Title", "Content"])
+
+    def test_render_string_and_node_variables(self):
+        template = Template("<title>{{ Title }}</title>{{ Content }}")
+        content = ParentNode("p", [LeafNode("b", "bold")])
+        self.assertEqual(template.render({"Title": "Home", "Content": content}), "<title>Home</title><p><b>bold</b></p>")
+
+    def test_arbitrary_variables(self):
+        template = Template("{{Title}} by {{ author }} on {{ date }}")
+        self.assertEqual(template.render({"Title": "Post", "author": "Filip", "date": "2024-01-01"}), "Post by Filip on 2024-01-01")
+
+    def test_missing_variable_left_in_place(self):
+        template = Template("<p>{{ Missing }}</p>")
+        self.assertEqual(template.render({}), "<p>{{ Missing }}</p>")
+
+    def test_repeated_slot(self):
+        template = Template("{{ Title }} - {{ Title }}")
+        self.assertEqual(template.render({"Title": "Home"}), "Home - Home")
+
+    def test_base_path_rewritten_when_compiled(self):
+        template = Template("<link href=\"/index.css\"><a href=\"https://example.com\"></a>{{ Content }}", BasePathRewriter("/site/"))
+        self.assertEqual(template.literals, ["<link href=\"/site/index.css\"><a href=\"https://example.com\"></a>", ""])
+
+    def test_content_nodes_are_not_rescanned(self):
+        template = Template("{{ Content }}", BasePathRewriter("/site/"))
+        content = markdown_to_html_node("[link](/blog) ![Tom](/images/tom.png) `<a href=\"/literal\">`", template.url_rewriter)
+        self.assertEqual(
+            template.render({"Content": content}),
+            "<div><p><a href=\"/site/blog\">link</a> <img src=\"/site/images/tom.png\" alt=\"Tom\"></img> "
+            "<code><a href=\"/literal\"></code></p></div>")
+
+    def test_write_matches_render(self):
+        template = Template("<title>{{ Title }}</title>")
+        buffer = io.StringIO()
+        template.write(buffer, {"Title": "Home"})
+        self.assertEqual(buffer.getvalue(), template.render({"Title": "Home"}))
+
+class TestTemplateIndex(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.root = self.directory.name
+        self.content_path = os.path.join(self.root, "content")
+        for name in ["template", "blog", "blog.archive"]:
+            with open(os.path.join(self.root, f"{name}.html"), "w") as file:
+                file.write(f"<main class=\"{name}\">{{{{ Content }}}}</main>")
+        self.index = TemplateIndex(self.root, self.content_path)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_templates_compiled_once(self):
+        self.assertEqual(sorted(self.index.templates), ["blog", "blog.archive", "template"])
+        self.assertEqual(self.index.templates["blog"].literals, ["<main class=\"blog\">", "</main>"])
+        self.assertEqual(self.index.files["blog"][0], os.path.join(self.root, "blog.html"))
+
+    def test_resolve_by_directory(self):
+        self.assertEqual(self.index.resolve(os.path.join(self.content_path, "index.md")), "template")
+        self.assertEqual(self.index.resolve(os.path.join(self.content_path, "contact", "index.md")), "template")
+        self.assertEqual(self.index.resolve(os.path.join(self.content_path, "blog", "tom", "index.md")), "blog")
+        self.assertEqual(self.index.resolve(os.path.join(self.content_path, "blog", "archive", "2020", "index.md")), "blog.archive")
+        self.assertEqual(self.index.directories[os.path.join("blog", "tom")], "blog")
+
+    def test_resolve_by_name(self):
+        self.assertEqual(self.index.resolve(os.path.join(self.content_path, "index.md"), "blog"), "blog")
+        with self.assertRaises(Exception):
+            self.index.resolve(os.path.join(self.content_path, "index.md"), "missing")
+
+    def test_single_template_with_any_name_is_default(self):
+        with tempfile.TemporaryDirectory() as directory:
+            with open(os.path.join(directory, "layout.html"), "w") as file:
+                file.write("{{ Content }}")
+            self.assertEqual(TemplateIndex(directory, self.content_path).resolve(os.path.join(self.content_path, "index.md")), "layout")
+
+if __name__ == "__main__":
+    unittest.main()
@@ -46,6 +46,11 @@ class TestTextNode(unittest.TestCase):
         node2 = TextNode("This is a text node", TextType.LINK)
         self.assertNotEqual(node, node2)
 
+    def test_no_instance_dict(self):
+        node = TextNode("This is a text node", TextType.TEXT)
+        self.assertFalse(hasattr(node, "__dict__"))
+        self.assertEqual(repr(node), "TextNode(This is a text node, text, None)")
+
 class TestSplitNodesDelimiter(unittest.TestCase):
     def test_just_text_single_node(self):
         nodes = [TextNode("this is just text without delimiters", TextType.TEXT)]
@@ -190,7 +195,22 @@ class TestExtractMarkdownImagesAndLinks(unittest.TestCase):
         self.assertEqual(extract_markdown_images(text), expected_images_output)
         self.assertEqual(extract_markdown_links(text), expected_link_output)
 
+    def test_image_after_parenthesised_text(self):
+        text = "An aside (not a url) then ![a cat](/cat.png) and [a link](/link)"
+        self.assertEqual(extract_markdown_images(text), [("a cat", "/cat.png")])
+
 class TestSplitNodesImagesAndLinks(unittest.TestCase):
+    def test_split_many_links_one_node(self):
+        text_node = TextNode("[a](/a) and [b](/b)" * 500 + " tail", TextType.TEXT)
+        new_nodes = split_nodes_link([text_node])
+        self.assertEqual(len(new_nodes), 1501)
+        self.assertEqual(new_nodes[:3], [TextNode("a", TextType.LINK, "/a"), TextNode(" and ", TextType.TEXT), TextNode("b", TextType.LINK, "/b")])
+        self.assertEqual(new_nodes[-1], TextNode(" tail", TextType.TEXT))
+
+    def test_split_keeps_non_text_and_linkless_nodes(self):
+        text_nodes = [TextNode("[bold](/not-a-link)", TextType.BOLD), TextNode("plain", TextType.TEXT), TextNode("", TextType.TEXT)]
+        self.assertEqual(split_nodes_link(text_nodes), text_nodes[:2])
+
     def test_split_one_image_one_node(self):
         text_node = TextNode(
             "this is a text and this is ![an image of Empire State Building](https://www.esbnyc.com/sites/default/files/2024-06/ESB-DarkBlueSky.jpg)", 
@@ -522,5 +542,56 @@ class TestTextToTextNodes(unittest.TestCase):
         ]
         self.assertEqual(text_to_textnodes(text), expected_output)
 
+    def test_code_takes_precedence(self):
+        text = "Run `a*b*c` or `[x](y)` here"
+        expected_output = [
+            TextNode("Run ", TextType.TEXT),
+            TextNode("a*b*c", TextType.CODE),
+            TextNode(" or ", TextType.TEXT),
+            TextNode("[x](y)", TextType.CODE),
+            TextNode(" here", TextType.TEXT)
+        ]
+        self.assertEqual(text_to_textnodes(text), expected_output)
+
+    def test_markup_inside_link_text(self):
+        text = "See [the **bold** docs](https://www.boot.dev/) now"
+        expected_output = [
+            TextNode("See ", TextType.TEXT),
+            TextNode("the **bold** docs", TextType.LINK, "https://www.boot.dev/"),
+            TextNode(" now", TextType.TEXT)
+        ]
+        self.assertEqual(text_to_textnodes(text), expected_output)
+
+    def test_emphasis_does_not_cross_links_or_code(self):
+        for text in ["Edit my_notes.md or see [the guide](/docs/setup_guide)",
+                     "a *star ![image](/a*b.png) here",
+                     "an _open `code_span` here"]:
+            with self.assertRaises(ValueError):
+                text_to_textnodes(text)
+
+    def test_emphasis_around_whole_links(self):
+        text = "*see [the guide](/docs/setup_guide)* now"
+        self.assertEqual(text_to_textnodes(text), [
+            TextNode("see [the guide](/docs/setup_guide)", TextType.ITALIC),
+            TextNode(" now", TextType.TEXT)
+        ])
+
+    def test_unterminated_bold_runs_to_the_end(self):
+        self.assertEqual(text_to_textnodes("**snake_case"), [TextNode("snake_case", TextType.BOLD)])
+        self.assertEqual(text_to_textnodes("a **b** c **d"), [
+            TextNode("a ", TextType.TEXT),
+            TextNode("b", TextType.BOLD),
+            TextNode(" c ", TextType.TEXT),
+            TextNode("d", TextType.BOLD)
+        ])
+
+    def test_unmatched_delimiter(self):
+        for text in ["An *unfinished italic", "snake_case", "a ` stray backtick"]:
+            with self.assertRaises(ValueError):
+                text_to_textnodes(text)
+
+    def test_empty_text(self):
+        self.assertEqual(text_to_textnodes(""), [])
+
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,41 @@
+import unittest
+
+from urls import URLRewriter, BasePathRewriter, IDENTITY_REWRITER
+from textnode import TextNode, TextType, text_node_to_html_node
+
+class TestURLRewriter(unittest.TestCase):
+    def test_identity(self):
+        self.assertEqual(IDENTITY_REWRITER("/blog"), "/blog")
+        self.assertEqual(IDENTITY_REWRITER.rewrite_html("<a href=\"/blog\"></a>"), "<a href=\"/blog\"></a>")
+
+    def test_base_path_prefixes_root_relative_urls(self):
+        rewriter = BasePathRewriter("/site/")
+        self.assertEqual(rewriter("/blog"), "/site/blog")
+        self.assertEqual(rewriter("https://example.com"), "https://example.com")
+        self.assertEqual(rewriter("images/tom.png"), "images/tom.png")
+
+    def test_root_base_path_unchanged(self):
+        self.assertEqual(BasePathRewriter("/")("/blog"), "/blog")
+
+    def test_key_includes_base_path(self):
+        self.assertNotEqual(BasePathRewriter("/a/").key, BasePathRewriter("/b/").key)
+
+    def test_rewrite_html(self):
+        rewriter = BasePathRewriter("/site/")
+        self.assertEqual(rewriter.rewrite_html("<link href=\"/index.css\"><img src=\"/x.png\"><p>href=/y</p>"),
+                         "<link href=\"/site/index.css\"><img src=\"/site/x.png\"><p>href=/y</p>")
+
+    def test_custom_rewriter(self):
+        class UpperRewriter(URLRewriter):
+            key = "upper"
+            def __call__(self, url):
+                return url.upper()
+        node = text_node_to_html_node(TextNode("link", TextType.LINK, "/blog"), UpperRewriter())
+        self.assertEqual(node.to_html(), "<a href=\"/BLOG\">link</a>")
+
+    def test_nested_link_rewritten(self):
+        node = text_node_to_html_node(TextNode("[docs](/docs)", TextType.BOLD), BasePathRewriter("/site/"))
+        self.assertEqual(node.to_html(), "<b><a href=\"/site/docs\">docs</a></b>")
+
+if __name__ == "__main__":
+    unittest.main()
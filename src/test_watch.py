@@ -0,0 +1,53 @@
+import os
+import tempfile
+import unittest
+
+from watch import PollingWatcher, is_within
+
+class TestPollingWatcher(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.root = self.directory.name
+        self.page_path = self.write(os.path.join("content", "blog", "index.md"), "# Blog")
+        self.template_path = self.write("template.html", "{{ Content }}")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def write(self, relative_path, text):
+        path = os.path.join(self.root, relative_path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as file:
+            file.write(text)
+        return path
+
+    def test_no_changes(self):
+        watcher = PollingWatcher([os.path.join(self.root, "content"), self.template_path])
+        self.assertEqual(watcher.poll(), ([], []))
+
+    def test_changed_added_and_removed(self):
+        watcher = PollingWatcher([os.path.join(self.root, "content"), self.template_path])
+        self.write(os.path.join("content", "blog", "index.md"), "# Blog, now longer")
+        new_path = self.write(os.path.join("content", "about.md"), "# About")
+        os.remove(self.template_path)
+        self.assertEqual(watcher.poll(), (sorted([self.page_path, new_path]), [self.template_path]))
+        self.assertEqual(watcher.poll(), ([], []))
+
+    def test_shallow_paths_watch_matching_files_only(self):
+        watcher = PollingWatcher([], {self.root: ".html"})
+        self.assertEqual(watcher.snapshot.keys(), {self.template_path})
+        new_template_path = self.write("blog.html", "<main>{{ Content }}</main>")
+        self.write("notes.txt", "not a template")
+        self.write(os.path.join("nested", "page.html"), "not watched")
+        self.assertEqual(watcher.poll(), ([new_template_path], []))
+        os.remove(new_template_path)
+        self.assertEqual(watcher.poll(), ([], [new_template_path]))
+
+    def test_is_within(self):
+        content_path = os.path.join(self.root, "content")
+        self.assertTrue(is_within(self.page_path, content_path))
+        self.assertFalse(is_within(self.template_path, content_path))
+        self.assertFalse(is_within(os.path.join(self.root, "content-old", "index.md"), content_path))
+
+if __name__ == "__main__":
+    unittest.main()
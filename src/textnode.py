@@ -1,5 +1,7 @@
 from enum import Enum
 from leafnode import LeafNode
+from parentnode import ParentNode
+from urls import IDENTITY_REWRITER
 import re
 
 class TextType(Enum):
@@ -10,7 +12,22 @@ class TextType(Enum):
     LINK = "link"
     IMAGE = "image"
 
+EMPHASIS_SPAN = r"`[^`]*`|\[[^\[\]]*\]\([^\(\)]*\)"
+INLINE_PATTERN = re.compile(
+    r"`(?P<code>[^`]*)`"
+    r"|!\[(?P<alt>[^\[\]]*)\]\((?P<src>[^\(\)]*)\)"
+    r"|(?<!!)\[(?P<text>[^\[\]]*)\]\((?P<href>[^\(\)]*)\)"
+    rf"|\*\*(?P<bold>(?:{EMPHASIS_SPAN}|[^\[\]`])*?)(?:\*\*|$)"
+    rf"|\*(?P<star>(?:{EMPHASIS_SPAN}|[^*\[\]`])*)\*"
+    rf"|_(?P<underscore>(?:{EMPHASIS_SPAN}|[^_\[\]`])*)_"
+)
+INLINE_DELIMITERS = ("*", "_", "`")
+IMAGE_PATTERN = re.compile(r"!\[([^\[\]]*)\]\(([^\(\)]*)\)")
+LINK_PATTERN = re.compile(r"(?<!!)\[([^\[\]]*)\]\(([^\(\)]*)\)")
+
 class TextNode:
+    __slots__ = ("text", "text_type", "url")
+
     def __init__(self, text, text_type, url=None):
         self.text = text
         self.text_type = text_type
@@ -22,34 +39,34 @@ class TextNode:
     def __repr__(self):
         return f"TextNode({self.text}, {self.text_type.value}, {self.url})"
 
-def text_node_to_html_node(text_node):
+def text_node_to_html_node(text_node, url_rewriter=IDENTITY_REWRITER):
     match text_node.text_type:
         case TextType.TEXT:
             return LeafNode(None, text_node.text)
         case TextType.BOLD:
-            return LeafNode("b", text_node.text)
+            return nested_html_node("b", text_node.text, None, url_rewriter)
         case TextType.ITALIC:
-            return LeafNode("i", text_node.text)
+            return nested_html_node("i", text_node.text, None, url_rewriter)
         case TextType.CODE:
             return LeafNode("code", text_node.text)
         case TextType.LINK:
-            return LeafNode("a", text_node.text, {"href": f"{text_node.url}"})
+            return nested_html_node("a", text_node.text, {"href": url_rewriter(text_node.url)}, url_rewriter)
         case TextType.IMAGE:
-            return LeafNode("img", "", {"src": f"{text_node.url}", "alt": f"{text_node.text}"})
+            return LeafNode("img", "", {"src": url_rewriter(text_node.url), "alt": text_node.text})
         case _:
             raise Exception("unknown text type")
 
+def nested_html_node(tag, text, props=None, url_rewriter=IDENTITY_REWRITER):
+    text_nodes = scan_inline(text)
+    if all(node.text_type == TextType.TEXT for node in text_nodes):
+        return LeafNode(tag, text, props)
+    return ParentNode(tag, [text_node_to_html_node(node, url_rewriter) for node in text_nodes], props)
+
 def extract_markdown_images(text):
-    alt_text_list = re.findall(r"!\[(.*?)\]", text)
-    url_list = re.findall(r"\((.*?)\)", text)
-    image_tuples = []
-    for i in range(0, len(alt_text_list)):
-        image_tuple = (alt_text_list[i], url_list[i])
-        image_tuples.append(image_tuple)
-    return image_tuples
+    return IMAGE_PATTERN.findall(text)
 
 def extract_markdown_links(text):
-    link_list = re.findall(r"(?<!!)\[([^\[\]]*)\]\(([^\(\)]*)\)", text)
+    link_list = LINK_PATTERN.findall(text)
     return link_list
 
 def split_nodes_delimiter(old_nodes, delimiter, text_type):
@@ -69,63 +86,68 @@ def split_nodes_delimiter(old_nodes, delimiter, text_type):
             node_text_split = node.text.split(delimiter)
             for i in range(0, len(node_text_split)):
                 if i % 2 != 0:
-                    new_nodes.append(TextNode(f"{node_text_split[i]}", text_type))
+                    new_nodes.append(TextNode(node_text_split[i], text_type))
                 elif node_text_split[i]:
-                    new_nodes.append(TextNode(f"{node_text_split[i]}", TextType.TEXT))
+                    new_nodes.append(TextNode(node_text_split[i], TextType.TEXT))
     return new_nodes
 
 def split_nodes_image(old_nodes):
-    new_nodes = []
-    for node in old_nodes:
-        if not node.text:
-            continue
-
-        node_images = extract_markdown_images(node.text)
-        node_text = node.text
-
-        if not node_images or node.text_type != TextType.TEXT:
-            new_nodes.append(node)
-            continue
-
-        for i in range(0, len(node_images)):
-            node_text_split = node_text.split(f"![{node_images[i][0]}]({node_images[i][1]})", 1)
-            if node_text_split[0] != "":
-                new_nodes.append(TextNode(f"{node_text_split[0]}", TextType.TEXT))
-            new_nodes.append(TextNode(f"{node_images[i][0]}", TextType.IMAGE, f"{node_images[i][1]}"))
-            if i == len(node_images) - 1 and node_text_split[1] != "":
-                new_nodes.append(TextNode(f"{node_text_split[1]}", TextType.TEXT))
-            node_text = node_text_split[1]
-    return new_nodes
+    return split_nodes_pattern(old_nodes, IMAGE_PATTERN, TextType.IMAGE)
 
 def split_nodes_link(old_nodes):
+    return split_nodes_pattern(old_nodes, LINK_PATTERN, TextType.LINK)
+
+def split_nodes_pattern(old_nodes, pattern, text_type):
     new_nodes = []
     for node in old_nodes:
         if not node.text:
             continue
-
-        node_links = extract_markdown_links(node.text)
-        node_text = node.text
-
-        if not node_links or node.text_type != TextType.TEXT:
+        if node.text_type != TextType.TEXT:
             new_nodes.append(node)
             continue
 
-        for i in range(0, len(node_links)):
-            node_text_split = node_text.split(f"[{node_links[i][0]}]({node_links[i][1]})", 1)
-            if node_text_split[0] != "":
-                new_nodes.append(TextNode(f"{node_text_split[0]}", TextType.TEXT))
-            new_nodes.append(TextNode(f"{node_links[i][0]}", TextType.LINK, f"{node_links[i][1]}"))
-            if i == len(node_links) - 1 and node_text_split[1] != "":
-                new_nodes.append(TextNode(f"{node_text_split[1]}", TextType.TEXT))
-            node_text = node_text_split[1]
+        node_text = node.text
+        position = 0
+        for match in pattern.finditer(node_text):
+            if match.start() > position:
+                new_nodes.append(TextNode(node_text[position:match.start()], TextType.TEXT))
+            new_nodes.append(TextNode(match.group(1), text_type, match.group(2)))
+            position = match.end()
+        if position == 0:
+            new_nodes.append(node)
+        elif position < len(node_text):
+            new_nodes.append(TextNode(node_text[position:], TextType.TEXT))
     return new_nodes
 
 def text_to_textnodes(text):
-    text_nodes = [TextNode(text, TextType.TEXT)]
-    text_nodes = split_nodes_link(text_nodes)
-    text_nodes = split_nodes_image(text_nodes)
-    text_nodes = split_nodes_delimiter(text_nodes, "**", TextType.BOLD)
-    text_nodes = split_nodes_delimiter(text_nodes, "*", TextType.ITALIC)
-    text_nodes = split_nodes_delimiter(text_nodes, "_", TextType.ITALIC)
-    text_nodes = split_nodes_delimiter(text_nodes, "`", TextType.CODE)
-    return text_nodes
\ No newline at end of file
+    text_nodes = scan_inline(text)
+    for node in text_nodes:
+        if node.text_type == TextType.TEXT:
+            for delimiter in INLINE_DELIMITERS:
+                if delimiter in node.text:
+                    raise ValueError(f"Invalid markdown syntax - no text enclosed by delimiter {delimiter}")
+    return text_nodes
+
+def scan_inline(text):
+    text_nodes = []
+    position = 0
+    for match in INLINE_PATTERN.finditer(text):
+        if match.start() > position:
+            text_nodes.append(TextNode(text[position:match.start()], TextType.TEXT))
+        position = match.end()
+        match match.lastgroup:
+            case "code":
+                text_nodes.append(TextNode(match.group("code"), TextType.CODE))
+            case "src":
+                text_nodes.append(TextNode(match.group("alt"), TextType.IMAGE, match.group("src")))
+            case "href":
+                text_nodes.append(TextNode(match.group("text"), TextType.LINK, match.group("href")))
+            case "bold":
+                text_nodes.append(TextNode(match.group("bold"), TextType.BOLD))
+            case "star":
+                text_nodes.append(TextNode(match.group("star"), TextType.ITALIC))
+            case "underscore":
+                text_nodes.append(TextNode(match.group("underscore"), TextType.ITALIC))
+    if position < len(text):
+        text_nodes.append(TextNode(text[position:], TextType.TEXT))
+    return text_nodes
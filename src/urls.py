@@ -0,0 +1,24 @@
+import re
+
+URL_ATTRIBUTE_PATTERN = re.compile(r"\b(href|src)=\"([^\"]*)\"")
+
+class URLRewriter:
+    key = "identity"
+
+    def __call__(self, url):
+        return url
+
+    def rewrite_html(self, html):
+        return URL_ATTRIBUTE_PATTERN.sub(lambda match: f"{match.group(1)}=\"{self(match.group(2))}\"", html)
+
+class BasePathRewriter(URLRewriter):
+    def __init__(self, base_path="/"):
+        self.base_path = base_path
+        self.key = f"base_path:{base_path}"
+
+    def __call__(self, url):
+        if self.base_path != "/" and url[:1] == "/":
+            return self.base_path + url[1:]
+        return url
+
+IDENTITY_REWRITER = URLRewriter()
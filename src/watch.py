@@ -0,0 +1,50 @@
+import os
+import time
+
+class PollingWatcher:
+    def __init__(self, paths, shallow_paths=None):
+        self.paths = paths
+        self.shallow_paths = shallow_paths or {}
+        self.snapshot = take_snapshot(paths, self.shallow_paths)
+
+    def poll(self):
+        snapshot = take_snapshot(self.paths, self.shallow_paths)
+        changed = sorted(path for path, signature in snapshot.items() if self.snapshot.get(path) != signature)
+        removed = sorted(path for path in self.snapshot if path not in snapshot)
+        self.snapshot = snapshot
+        return changed, removed
+
+    def changes(self, interval):
+        while True:
+            time.sleep(interval)
+            changed, removed = self.poll()
+            if changed or removed:
+                yield changed, removed
+
+def take_snapshot(paths, shallow_paths=None):
+    snapshot = {}
+    for path in paths:
+        if os.path.isfile(path):
+            snapshot[path] = file_signature(os.stat(path))
+        elif os.path.isdir(path):
+            snapshot_directory(path, snapshot)
+    for directory_path, suffix in (shallow_paths or {}).items():
+        with os.scandir(directory_path) as entries:
+            for entry in entries:
+                if entry.is_file() and entry.name.endswith(suffix):
+                    snapshot[entry.path] = file_signature(entry.stat())
+    return snapshot
+
+def snapshot_directory(directory_path, snapshot):
+    with os.scandir(directory_path) as entries:
+        for entry in entries:
+            if entry.is_dir():
+                snapshot_directory(entry.path, snapshot)
+            elif entry.is_file():
+                snapshot[entry.path] = file_signature(entry.stat())
+
+def file_signature(stat_result):
+    return (stat_result.st_mtime_ns, stat_result.st_size)
+
+def is_within(path, directory_path):
+    return os.path.commonpath([os.path.abspath(path), os.path.abspath(directory_path)]) == os.path.abspath(directory_path)